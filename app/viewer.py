@@ -1,50 +1,325 @@
-import json
+import collections
+import contextlib
+import io
 import os
+import shutil
 import time
-import subprocess
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List
 
+import orjson
+import pandas as pd
 import streamlit as st
 
+# Add the parent directory to the path so we can import the CLI and pipeline modules
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import run as cli
+from pipeline import llm
+from pipeline.models import CandidateList, NewTopicCandidate, NewTopicResponse
+
 st.set_page_config(page_title="Signals POC Runner", layout="wide")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_MEETING = REPO_ROOT / "data" / "sample_meeting_real.json"
 DEFAULT_TAXONOMY = REPO_ROOT / "data" / "base_taxonomy.json"
-RUNS_DIR = REPO_ROOT / "runs"
+RUNS_DIR = Path(os.environ.get("SIGNALS_RUNS_DIR") or REPO_ROOT / "runs")
 RUNS_DIR.mkdir(parents=True, exist_ok=True)
+# Uploads are persisted here in the background, then renamed into the run dir
+STAGING_DIR = RUNS_DIR / ".staging"
 
 # Persist currently active run dir across reruns so UI doesn't collapse
 if "active_run_dir" not in st.session_state:
     st.session_state["active_run_dir"] = None
 
+CANDIDATES_PAGE_SIZE = 50
+CANDIDATE_STATUSES = ["Pending", "Approve as new", "Merge into", "Reject"]
+LOG_TAIL_BYTES = 64 * 1024
+LIVE_LOG_LINES = 200
+LIVE_LOG_REFRESH_S = 0.25
+TABLE_PREVIEW_ROWS = 500
+
+# Accepted artifact filenames, in order of preference
+NEW_TOPICS_NAMES = ("new_topics.json", "new-topics.json")
+TAXONOMY_NAMES = ("taxonomy_updated.json", "taxonomy.json", "taxonomy_json_updated.json")
+MENTIONS_NAMES = ("mentions.json", "chunk_mentions.json")
+
 
 def save_upload(uploaded_file, path: Path):
-    path.write_bytes(uploaded_file.getbuffer())
+    # Stream in 64 KB blocks rather than materialising the whole upload again
+    uploaded_file.seek(0)
+    with path.open("wb", buffering=1 << 16) as fh:
+        shutil.copyfileobj(uploaded_file, fh, 1 << 16)
+
+
+def check_meeting(data) -> str | None:
+    if not isinstance(data, dict):
+        return "meeting JSON must be an object"
+    if "transcript" not in data:
+        return "meeting JSON has no 'transcript' field"
+    return None
+
+
+def check_taxonomy(data) -> str | None:
+    # load_taxonomy accepts a bare list or the update-taxonomy output wrapper
+    if isinstance(data, dict):
+        data = data.get("taxonomy_json_updated")
+    if not isinstance(data, list) or not all(isinstance(t, dict) for t in data):
+        return "taxonomy JSON must be a list of topic objects"
+    return None
+
+
+def stage_upload(uploaded_file, path: Path, check) -> str | None:
+    """Persist an upload and run a cheap shape check; returns an error message or None."""
+    save_upload(uploaded_file, path)
+    try:
+        data = orjson.loads(uploaded_file.getvalue())
+    except orjson.JSONDecodeError as e:
+        return f"{uploaded_file.name} is not valid JSON: {e}"
+    err = check(data)
+    return f"{uploaded_file.name}: {err}" if err else None
+
+
+def prestage_upload(kind: str, uploaded_file, check):
+    """Start staging an upload the moment the uploader returns it.
+
+    Returns `(file_id, staged_path, future)` or None when nothing is uploaded.
+    The future is kept in session state so "Run pipeline" only has to join it.
+    """
+    key = f"upload_future::{kind}"
+    staged = st.session_state.get(key)
+    if uploaded_file is None or (staged and staged[0] != uploaded_file.file_id):
+        if staged:
+            staged[2].cancel()
+            staged[1].unlink(missing_ok=True)
+        st.session_state.pop(key, None)
+        staged = None
+    if uploaded_file is None:
+        return None
+    if staged is None:
+        if "upload_pool" not in st.session_state:
+            st.session_state["upload_pool"] = ThreadPoolExecutor(max_workers=2)
+        STAGING_DIR.mkdir(exist_ok=True)
+        path = STAGING_DIR / f"{uploaded_file.file_id}-{kind}.json"
+        fut = st.session_state["upload_pool"].submit(stage_upload, uploaded_file, path, check)
+        staged = st.session_state[key] = (uploaded_file.file_id, path, fut)
+    return staged
+
+
+def stage_input(staged, default: Path, dest: Path) -> str | None:
+    """Move a pre-staged upload into the run dir (or copy the sample); returns an error or None."""
+    if staged is None:
+        shutil.copyfile(default, dest)
+        return None
+    _, path, fut = staged
+    err = fut.result()
+    if err is None:
+        shutil.move(path, dest)
+    else:
+        # The caller drops the staging entry, so nothing else would clean this up
+        path.unlink(missing_ok=True)
+    return err
+
+
+class LiveLog(io.StringIO):
+    """StringIO that also mirrors the last few lines into a Streamlit placeholder.
+
+    `tail` is shared between stdout and stderr so the live view interleaves them
+    the way a terminal would, while each stream still keeps its full text.
+    """
+
+    def __init__(self, placeholder, tail: collections.deque):
+        super().__init__()
+        self.placeholder = placeholder
+        self.tail = tail
+        self._partial = ""
+        self._last_paint = 0.0
+
+    def write(self, s: str) -> int:
+        n = super().write(s)
+        lines = (self._partial + s).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            self.tail.extend(lines)
+            now = time.monotonic()
+            if now - self._last_paint >= LIVE_LOG_REFRESH_S:
+                self._last_paint = now
+                self.placeholder.code("\n".join(self.tail))
+        return n
+
+
+def run_cli(args, placeholder=None):
+    """Run our existing CLI in-process so we don't reimplement pipeline logic here.
+
+    `args` keeps the `python run.py <subcommand> ...` shape; everything after the
+    script path is dispatched through the CLI's own parser. If `placeholder`
+    (an `st.empty()`) is given, output is streamed into it while the step runs.
+    """
+    # A fresh interpreter would pick up sidebar config from the environment
+    llm.MODEL = os.environ.get("OPENAI_MODEL", llm.MODEL)
+    if llm._client is not None and llm._client.api_key != os.environ.get("OPENAI_API_KEY"):
+        llm._client = None
+    if placeholder is None:
+        out, err = io.StringIO(), io.StringIO()
+    else:
+        tail = collections.deque(maxlen=LIVE_LOG_LINES)
+        out, err = LiveLog(placeholder, tail), LiveLog(placeholder, tail)
+    rc = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            cli.main(args[2:])
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                rc = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                rc = 1
+        except Exception:
+            traceback.print_exc()
+            rc = 1
+    if placeholder is not None:
+        placeholder.empty()
+    return rc, out.getvalue(), err.getvalue()
 
 
-def run_cli(args):
-    """Run our existing CLI so we don't reimplement pipeline logic here."""
-    proc = subprocess.run(args, capture_output=True, text=True)
-    return proc.returncode, proc.stdout, proc.stderr
+@st.cache_data(show_spinner=False)
+def _cached_read(path_str: str, mtime_ns: int, size: int):
+    # mtime/size are only part of the cache key so rewritten files are re-parsed
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def remember_review(review_key: str, field: str, cid: str, widget_key: str):
+    """on_change callback: copy one candidate widget's value into the review state."""
+    st.session_state[review_key][field][cid] = st.session_state[widget_key]
+
+
+def show_logs(out_dir: Path, step: str, out: str, err: str):
+    """Persist a step's stdout/stderr under the run dir and render only their tails.
+
+    Full logs stay on disk (and behind a download button) so reruns don't ship
+    megabytes of chunk-tag output back to the browser.
+    """
+    for stream, text in (("stdout", out), ("stderr", err)):
+        log_path = out_dir / f"{step}.{stream}.log"
+        data = (text or "").encode("utf-8")
+        log_path.write_bytes(data)
+        with st.expander(f"{stream} ({step})"):
+            st.code(data[-LOG_TAIL_BYTES:].decode("utf-8", errors="ignore"))
+            if len(data) > LOG_TAIL_BYTES:
+                st.download_button(
+                    f"Download full {stream}", data=data, file_name=log_path.name,
+                    key=f"log_dl::{out_dir.name}::{step}::{stream}",
+                )
 
 
 def read_json(path: Path):
-    if not path.exists():
+    try:
+        s = path.stat()
+    except FileNotFoundError:
         return None
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _cached_read(str(path), s.st_mtime_ns, s.st_size)
     except Exception as e:
         return {"_error": f"Failed to read {path.name}: {e}"}
 
 
-def find_first(out_dir: Path, candidates):
-    for name in candidates:
-        p = out_dir / name
-        if p.exists():
-            return p
-    return None
+@st.cache_data(show_spinner=False)
+def _list_runs(root_mtime_ns: int):
+    # RUNS_DIR's mtime only changes when a run dir is added or removed
+    with os.scandir(RUNS_DIR) as it:
+        return sorted((e.name for e in it if e.is_dir() and not e.name.startswith(".")), reverse=True)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_frame(path_str: str, mtime_ns: int, size: int, records_key: str):
+    data = _cached_read(path_str, mtime_ns, size)
+    if isinstance(data, dict):
+        data = data.get(records_key, data)
+    if not isinstance(data, list):
+        return None
+    return pd.json_normalize(data)
+
+
+def show_table(path: Path, records_key: str, key: str):
+    """Render a JSON artifact as a capped, virtualized table plus a full download.
+
+    `st.json` would ship the whole document over the websocket on every rerun;
+    a DataFrame preview keeps that proportional to TABLE_PREVIEW_ROWS. Returns
+    False if the file isn't a list of records (the caller falls back to st.json).
+    """
+    try:
+        stt = path.stat()
+        df = _cached_frame(str(path), stt.st_mtime_ns, stt.st_size, records_key)
+    except Exception:
+        return False
+    if df is None:
+        return False
+    st.dataframe(df.head(TABLE_PREVIEW_ROWS))
+    if len(df) > TABLE_PREVIEW_ROWS:
+        st.caption(f"Showing first {TABLE_PREVIEW_ROWS} of {len(df)} rows.")
+    st.download_button(
+        "Download full JSON", data=path.read_bytes(), file_name=path.name,
+        mime="application/json", key=key,
+    )
+    return True
+
+
+def scan_dir(p: Path):
+    """Map entry name -> os.DirEntry for one directory in a single scandir pass."""
+    try:
+        with os.scandir(p) as it:
+            return {e.name: e for e in it}
+    except FileNotFoundError:
+        return {}
+
+
+@st.cache_data(show_spinner=False)
+def _cached_merge_map(path_str: str, mtime_ns: int, size: int):
+    doc = orjson.loads(Path(path_str).read_bytes())
+    suggestions = (doc.get("suggestions") if isinstance(doc, dict) else None) or []
+    merge_map = {m.get("candidate"): (m.get("target"), m.get("score")) for m in suggestions}
+    captions = {
+        cid: f"suggested merge→ {tgt} (score {sc:.2f})" if sc is not None else f"suggested merge→ {tgt}"
+        for cid, (tgt, sc) in merge_map.items()
+    }
+    return merge_map, captions
+
+
+def load_merge_map(path: Path):
+    """Return ({candidate: (target, score)}, {candidate: caption}) from merge_suggestions.json."""
+    try:
+        s = path.stat()
+        return _cached_merge_map(str(path), s.st_mtime_ns, s.st_size)
+    except Exception:
+        return {}, {}
+
+
+@st.cache_data(show_spinner=False)
+def _cached_candidates(path_str: str, mtime_ns: int, size: int) -> List[NewTopicCandidate]:
+    raw = Path(path_str).read_bytes()
+    if raw.lstrip()[:1] == b"[":
+        return CandidateList.validate_json(raw)
+    return NewTopicResponse.model_validate_json(raw).new_topics
+
+
+def load_candidates(path: Path):
+    """Decode new_topics.json (either {"new_topics": [...]} or a bare list) into typed candidates.
+
+    Returns (candidates, error_message).
+    """
+    try:
+        s = path.stat()
+        return _cached_candidates(str(path), s.st_mtime_ns, s.st_size), None
+    except Exception as e:
+        return [], f"Failed to read {path.name}: {e}"
+
+
+def find_first(out_dir: Path, candidates, entries):
+    """First of `candidates` present in `entries` (a scan_dir() of out_dir), as a path."""
+    return next((out_dir / name for name in candidates if name in entries), None)
 
 
 st.sidebar.header("Config")
@@ -67,10 +342,12 @@ st.title("Signals POC — Upload & Run")
 col1, col2 = st.columns(2)
 with col1:
     meeting_up = st.file_uploader("Meeting transcript JSON", type=["json"], key="meeting_json")
+    meeting_staged = prestage_upload("meeting", meeting_up, check_meeting)
     if use_sample and meeting_up is None:
         st.caption(f"Using sample: {DEFAULT_MEETING}")
 with col2:
     tax_up = st.file_uploader("Taxonomy JSON (optional)", type=["json"], key="taxonomy_json")
+    tax_staged = prestage_upload("taxonomy", tax_up, check_taxonomy)
     if use_sample and tax_up is None:
         st.caption(f"Using sample: {DEFAULT_TAXONOMY}")
 
@@ -88,44 +365,48 @@ if go:
     meeting_path = out_dir / "input_meeting.json"
     taxonomy_path = out_dir / "input_taxonomy.json"
 
-    if meeting_up is not None:
-        save_upload(meeting_up, meeting_path)
-    else:
-        meeting_path.write_bytes(DEFAULT_MEETING.read_bytes())
-
-    if tax_up is not None:
-        save_upload(tax_up, taxonomy_path)
-    else:
-        taxonomy_path.write_bytes(DEFAULT_TAXONOMY.read_bytes())
+    # Uploads were written and shape-checked in the background while the user
+    # filled in the form; here we only join those futures and rename the files.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futs = [
+            pool.submit(stage_input, meeting_staged, DEFAULT_MEETING, meeting_path),
+            pool.submit(stage_input, tax_staged, DEFAULT_TAXONOMY, taxonomy_path),
+        ]
+        errors = [e for e in (f.result() for f in as_completed(futs)) if e]
+    # Staged files have been moved; a rerun with the same upload stages it afresh
+    st.session_state.pop("upload_future::meeting", None)
+    st.session_state.pop("upload_future::taxonomy", None)
+    if errors:
+        for e in errors:
+            st.error(e)
+        st.stop()
 
     st.write(f"**Run dir:** `{out_dir}`")
 
     # Step 1: detect-new-topics
     st.subheader("Step 1: Detect New Topics")
+    log_ph = st.empty()
     rc1, out1, err1 = run_cli([
         "python", str(REPO_ROOT / "run.py"),
         "detect-new-topics",
         "--meeting", str(meeting_path),
         "--taxonomy", str(taxonomy_path),
         "--out", str(out_dir),
-    ])
-    with st.expander("stdout (detect-new-topics)"):
-        st.code(out1 or "")
-    with st.expander("stderr (detect-new-topics)"):
-        st.code(err1 or "")
+    ], log_ph)
+    show_logs(out_dir, "detect-new-topics", out1, err1)
     if rc1 != 0:
         st.error("detect-new-topics failed")
         st.stop()
 
     # Step 2: update-taxonomy (auto-approve optional)
     st.subheader("Step 2: Update Taxonomy")
-    new_topics_file = find_first(out_dir, ["new_topics.json", "new-topics.json"]) or (out_dir / "new_topics.json")
-    if auto_approve and (out_dir / "approved_new_topics.json").exists() is False:
-        # copy all detected candidates into approvals
-        nt = read_json(new_topics_file)
-        if nt:
-            (out_dir / "approved_new_topics.json").write_text(json.dumps(nt, indent=2))
-            st.caption("Auto-approved all detected topics.")
+    entries = scan_dir(out_dir)
+    new_topics_file = find_first(out_dir, NEW_TOPICS_NAMES, entries) or (out_dir / "new_topics.json")
+    if auto_approve and "approved_new_topics.json" not in entries and new_topics_file.name in entries:
+        # copy all detected candidates into approvals (byte copy, no parse/re-serialise)
+        shutil.copyfile(new_topics_file, out_dir / "approved_new_topics.json")
+        st.caption("Auto-approved all detected topics.")
+    log_ph = st.empty()
     rc2, out2, err2 = run_cli([
         "python", str(REPO_ROOT / "run.py"),
         "update-taxonomy",
@@ -134,11 +415,8 @@ if go:
         "--default-score", str(default_score),
         "--merge-threshold", str(merge_thr),
         "--out", str(out_dir),
-    ])
-    with st.expander("stdout (update-taxonomy)"):
-        st.code(out2 or "")
-    with st.expander("stderr (update-taxonomy)"):
-        st.code(err2 or "")
+    ], log_ph)
+    show_logs(out_dir, "update-taxonomy", out2, err2)
     if rc2 != 0:
         st.error("update-taxonomy failed")
         st.stop()
@@ -146,30 +424,29 @@ if go:
     # Step 3: chunk-tag
     st.subheader("Step 3: Chunk & Tag")
     effective = out_dir / "effective_taxonomy.json"
-    approved_p = out_dir / "approved_new_topics.json"
-    merges_p = out_dir / "merges.json"
-    tax_p = out_dir / "taxonomy_json_updated.json"
-    def mtime(p: Path) -> float:
-        try:
-            return p.stat().st_mtime
-        except Exception:
-            return 0.0
-    disabled_chunk = not effective.exists() or (tax_p.exists() and (mtime(tax_p) < max(mtime(approved_p), mtime(merges_p))))
+    entries = scan_dir(out_dir)
+    # Stale if approvals/merges were saved after the taxonomy was last updated
+    tax_e = entries.get("taxonomy_json_updated.json")
+    decisions = [entries[n] for n in ("approved_new_topics.json", "merges.json") if n in entries]
+    disabled_chunk = "effective_taxonomy.json" not in entries or (
+        tax_e is not None and bool(decisions)
+        and tax_e.stat().st_mtime < max(e.stat().st_mtime for e in decisions)
+    )
     rc3, out3, err3 = (0, "", "")
     if st.button("Run Chunk & Tag", disabled=disabled_chunk):
+        log_ph = st.empty()
         rc3, out3, err3 = run_cli([
         "python", str(REPO_ROOT / "run.py"),
         "chunk-tag",
         "--meeting", str(meeting_path),
-            "--taxonomy", str(effective if effective.exists() else taxonomy_path),
+            "--taxonomy", str(effective if "effective_taxonomy.json" in entries else taxonomy_path),
         "--out", str(out_dir),
-        ])
-    with st.expander("stdout (chunk-tag)"):
-        st.code(out3 or "")
-    with st.expander("stderr (chunk-tag)"):
-        st.code(err3 or "")
-    if rc3 != 0 and (out3 or err3):
-        st.error("chunk-tag failed")
+        ], log_ph)
+    if out3 or err3:
+        # Only when the step actually ran, so an earlier chunk-tag log isn't clobbered
+        show_logs(out_dir, "chunk-tag", out3, err3)
+        if rc3 != 0:
+            st.error("chunk-tag failed")
     if disabled_chunk:
         st.caption("Tip: Apply approvals to taxonomy first to enable Chunk & Tag.")
 
@@ -181,181 +458,205 @@ if go:
 if not results_dir and st.session_state.get("active_run_dir"):
     results_dir = Path(st.session_state["active_run_dir"]) if st.session_state.get("active_run_dir") else None
 
-if results_dir:
-    out_dir = results_dir
-    # Display artifacts
-    st.subheader("Results")
-    t1, t2, t3, t4 = st.tabs(["New Topics", "Updated Taxonomy", "Mentions", "Scores"]) 
+def render_artifact_tabs(out_dir: Path, interactive: bool = True):
+    """Render the New Topics / Taxonomy / Mentions / Scores tabs for one run dir.
+
+    With interactive=False (the sidebar run browser) artifacts are shown read-only.
+    Widget keys that both modes render carry a per-mode scope, so the same run can
+    be open in both places without key clashes.
+    """
+    scope = "results" if interactive else "browse"
+    t1, t2, t3, t4 = st.tabs(["New Topics", "Updated Taxonomy", "Mentions", "Scores"])
+    # One directory scan answers every existence check below
+    entries = scan_dir(out_dir)
 
     with t1:
-        f = find_first(out_dir, ["new_topics.json", "new-topics.json"]) 
-        candidates = read_json(f) if f else None
-        merges_doc = read_json(out_dir / "merge_suggestions.json") or {}
-        merges_list = merges_doc.get("suggestions") if isinstance(merges_doc, dict) else []
-        merge_map = {m.get("candidate"): (m.get("target"), m.get("score")) for m in (merges_list or [])}
-        if not candidates:
+        f = find_first(out_dir, NEW_TOPICS_NAMES, entries)
+        merge_map, merge_captions = load_merge_map(out_dir / "merge_suggestions.json")
+        if f is None:
             st.info("No new_topics.json found.")
+        elif not interactive:
+            st.json(read_json(f))
         else:
-            lst = candidates.get("new_topics") if isinstance(candidates, dict) else candidates
-            if not lst:
+            lst, cand_error = load_candidates(f)
+            if cand_error:
+                st.error(cand_error)
+            elif not lst:
                 st.info("No candidates.")
             else:
                 st.write("Approve or reject candidates. Changes are saved only when clicking Save.")
 
-                # Load saved approvals/rejections for defaults
-                approved_saved = (read_json(out_dir / "approved_new_topics.json") or {}).get("new_topics", [])
-                rejected_saved = (read_json(out_dir / "rejected.json") or {}).get("new_topics", [])
-                approved_ids = { (c.get("topic_id") or c.get("label")) for c in approved_saved }
-                rejected_ids = { (c.get("topic_id") or c.get("label")) for c in rejected_saved }
-
-                with st.form("approvals_form"):
-                    selections = {}
+                # Review state lives in session_state so a status click only updates
+                # that dict; it is seeded once per run dir from the saved files.
+                review_key = f"cand_review::{out_dir.name}"
+                if review_key not in st.session_state:
+                    # The form writes {"approved": [...]}/{"rejected": [...]}; auto-approve writes {"new_topics": [...]}
+                    approved_doc = read_json(out_dir / "approved_new_topics.json") or {}
+                    rejected_doc = read_json(out_dir / "rejected.json") or {}
+                    merges_saved = (read_json(out_dir / "merges.json") or {}).get("merges") or []
+                    status = {}
+                    for c in rejected_doc.get("rejected") or rejected_doc.get("new_topics") or []:
+                        status[c.get("topic_id") or c.get("label")] = "Reject"
+                    for m in merges_saved:
+                        status[m.get("from")] = "Merge into"
+                    for c in approved_doc.get("approved") or approved_doc.get("new_topics") or []:
+                        status[c.get("topic_id") or c.get("label")] = "Approve as new"
+                    st.session_state[review_key] = {
+                        "status": status,
+                        "merge": {m.get("from"): m.get("to") for m in merges_saved},
+                    }
+                review = st.session_state[review_key]
+
+                # Only the current page of candidates is rendered as widgets
+                n_pages = max(1, -(-len(lst) // CANDIDATES_PAGE_SIZE))
+                page = 1
+                if n_pages > 1:
+                    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"cand_page::{out_dir.name}")
+                    st.caption(f"{len(lst)} candidates, {CANDIDATES_PAGE_SIZE} per page.")
+                page_items = lst[(page - 1) * CANDIDATES_PAGE_SIZE: page * CANDIDATES_PAGE_SIZE]
+
+                # Dropdown options for "Merge into", built once per rerun rather than per row
+                existing_ids = sorted(p.get("id") for p in (read_json(out_dir/"taxonomy_json_updated.json") or []))
+                existing_pos = {tid: i for i, tid in enumerate(existing_ids)}
+                merge_options = ["(select)"] + existing_ids
+
+                for c in page_items:
+                    cid = c.topic_id or c.label
+                    row = st.columns([3,4,4,6])
+                    with row[0]:
+                        st.text(cid)
+                        if cid in merge_captions:
+                            st.caption(merge_captions[cid])
+                    with row[1]:
+                        st.caption(c.evidence)
+                    with row[2]:
+                        st.caption(c.why_new)
+                    with row[3]:
+                        key = f"cand_status::{out_dir.name}::{cid}"
+                        choice = st.radio(
+                            "Status", CANDIDATE_STATUSES,
+                            index=CANDIDATE_STATUSES.index(review["status"].get(cid, "Pending")),
+                            key=key, horizontal=True,
+                            on_change=remember_review, args=(review_key, "status", cid, key),
+                        )
+                        if choice == "Merge into":
+                            sel_key = f"merge_sel::{out_dir.name}::{cid}"
+                            pre = review["merge"].get(cid, merge_map.get(cid, (None, None))[0])
+                            st.selectbox(
+                                "Target", merge_options,
+                                index=existing_pos[pre] + 1 if pre in existing_pos else 0,
+                                key=sel_key,
+                                on_change=remember_review, args=(review_key, "merge", cid, sel_key),
+                            )
+
+                if st.button("Save approvals/rejections", key=f"save_review_{out_dir.name}"):
+                    status = review["status"]
+                    approved = [c.model_dump() for c in lst if status.get(c.topic_id or c.label) == "Approve as new"]
+                    rejected = [c for c in lst if status.get(c.topic_id or c.label) == "Reject"]
                     merges_out = {}
-                    for c in lst:
-                        cid = (c.get("topic_id") or c.get("label"))
-                        row = st.columns([3,4,4,6])
-                        with row[0]:
-                            st.text(cid)
-                            if cid in merge_map:
-                                tgt, sc = merge_map[cid]
-                                st.caption(f"suggested merge→ {tgt} (score {sc:.2f})")
-                        with row[1]:
-                            st.caption(c.get("evidence",""))
-                        with row[2]:
-                            st.caption(c.get("why_new",""))
-                        with row[3]:
-                            key = f"cand_status::{out_dir.name}::{cid}"
-                            if cid in approved_ids:
-                                default = 1
-                            elif cid in rejected_ids:
-                                default = 2
-                            else:
-                                default = 0
-                            choice = st.radio("Status", ["Pending", "Approve as new", "Merge into", "Reject"], index=default if default < 2 else 3, key=key, horizontal=True)
-                            selections[cid] = choice
-                            if choice == "Merge into":
-                                # dropdown of existing ids
-                                existing_ids = sorted([p.get("id") for p in (read_json(out_dir/"taxonomy_json_updated.json") or [])] or [])
-                                pre = merge_map.get(cid, (None, None))[0]
-                                to_id = st.selectbox("Target", ["(select)"] + existing_ids, index=(existing_ids.index(pre)+1) if pre in existing_ids else 0, key=f"merge_sel::{out_dir.name}::{cid}")
-                                if to_id != "(select)":
-                                    merges_out[cid] = {"to": to_id, "score": merge_map.get(cid, (None, None))[1]}
-
-                    submitted = st.form_submit_button("Save approvals/rejections")
-                    if submitted:
-                        approved = [c for c in lst if selections.get((c.get("topic_id") or c.get("label"))) == "Approve as new"]
-                        rejected = [c for c in lst if selections.get((c.get("topic_id") or c.get("label"))) == "Reject"]
-                        merges_json = {"merges": [{"from": k, "to": v["to"], "score": v.get("score"), "reason": "alias"} for k, v in merges_out.items()]}
-                        (out_dir / "approved_new_topics.json").write_text(json.dumps({"approved": approved}, indent=2))
-                        (out_dir / "rejected.json").write_text(json.dumps({"rejected": [{"topic_id": (c.get("topic_id") or c.get("label")), "label": c.get("label", "")} for c in rejected]}, indent=2))
-                        (out_dir / "merges.json").write_text(json.dumps(merges_json, indent=2))
-                        st.success("Saved approvals and merges.")
+                    for cid, choice in status.items():
+                        if choice != "Merge into":
+                            continue
+                        # An untouched selectbox shows the suggested target; "(select)" never matches
+                        to_id = review["merge"].get(cid, merge_map.get(cid, (None, None))[0])
+                        if to_id in existing_pos:
+                            merges_out[cid] = {"to": to_id, "score": merge_map.get(cid, (None, None))[1]}
+                    merges_json = {"merges": [{"from": k, "to": v["to"], "score": v.get("score"), "reason": "alias"} for k, v in merges_out.items()]}
+                    (out_dir / "approved_new_topics.json").write_bytes(orjson.dumps({"approved": approved}, option=orjson.OPT_INDENT_2))
+                    (out_dir / "rejected.json").write_bytes(orjson.dumps({"rejected": [{"topic_id": c.topic_id or c.label, "label": c.label} for c in rejected]}, option=orjson.OPT_INDENT_2))
+                    (out_dir / "merges.json").write_bytes(orjson.dumps(merges_json, option=orjson.OPT_INDENT_2))
+                    st.success("Saved approvals and merges.")
 
     with t2:
         # Support multiple possible output filenames from the CLI
-        f = find_first(out_dir, ["taxonomy_updated.json", "taxonomy.json", "taxonomy_json_updated.json"])
+        f = find_first(out_dir, TAXONOMY_NAMES, entries)
         data = read_json(f) if f else None
         if data is None:
             st.info("No updated taxonomy file found.")
-        else:
+        elif not show_table(f, "taxonomy_json_updated", f"dl_tax_{scope}_{out_dir.name}"):
             st.json(data)
-
-        st.markdown("---")
-        if st.button("Apply approvals to taxonomy", key=f"apply_tax_{out_dir.name}"):
-            taxonomy_path = out_dir / "input_taxonomy.json"
-            candidates_path = out_dir / "new_topics.json"  # CLI prefers approved_new_topics.json if present
-            rc_u, out_u, err_u = run_cli([
-                "python", str(REPO_ROOT / "run.py"),
-                "update-taxonomy",
-                "--taxonomy", str(taxonomy_path),
-                "--candidates", str(candidates_path),
-                "--default-score", str(default_score),
-                "--merge-threshold", "0.85",
-                "--out", str(out_dir),
-            ])
-            with st.expander("stdout (update-taxonomy)"):
-                st.code(out_u or "")
-            with st.expander("stderr (update-taxonomy)"):
-                st.code(err_u or "")
-            if rc_u != 0:
-                st.error("update-taxonomy failed")
-            else:
-                f2 = find_first(out_dir, ["taxonomy_updated.json", "taxonomy.json", "taxonomy_json_updated.json"])
-                st.success("Applied approvals to taxonomy.")
-                if f2:
-                    st.json(read_json(f2))
-
-        # Run Chunk & Tag directly from this tab (uses effective taxonomy if present)
-        st.markdown("---")
-        effective_ct = out_dir / "effective_taxonomy.json"
-        input_meeting = out_dir / "input_meeting.json"
-        disabled_ct = not (effective_ct.exists() and input_meeting.exists())
-        if st.button("Run Chunk & Tag now", key=f"chunk_now_{out_dir.name}", disabled=disabled_ct):
-            rc_c, out_c, err_c = run_cli([
-                "python", str(REPO_ROOT / "run.py"),
-                "chunk-tag",
-                "--meeting", str(input_meeting),
-                "--taxonomy", str(effective_ct if effective_ct.exists() else DEFAULT_TAXONOMY),
-                "--out", str(out_dir),
-            ])
-            with st.expander("stdout (chunk-tag)"):
-                st.code(out_c or "")
-            with st.expander("stderr (chunk-tag)"):
-                st.code(err_c or "")
-            if rc_c != 0:
-                st.error("chunk-tag failed")
-            else:
-                st.success("Chunk & Tag completed.")
-        if disabled_ct:
-            st.caption("Tip: Apply approvals to create effective_taxonomy.json, then run Chunk & Tag.")
+        if interactive:
+            st.markdown("---")
+            if st.button("Apply approvals to taxonomy", key=f"apply_tax_{out_dir.name}"):
+                taxonomy_path = out_dir / "input_taxonomy.json"
+                candidates_path = out_dir / "new_topics.json"  # CLI prefers approved_new_topics.json if present
+                log_ph = st.empty()
+                rc_u, out_u, err_u = run_cli([
+                    "python", str(REPO_ROOT / "run.py"),
+                    "update-taxonomy",
+                    "--taxonomy", str(taxonomy_path),
+                    "--candidates", str(candidates_path),
+                    "--default-score", str(default_score),
+                    "--merge-threshold", "0.85",
+                    "--out", str(out_dir),
+                ], log_ph)
+                show_logs(out_dir, "update-taxonomy", out_u, err_u)
+                if rc_u != 0:
+                    st.error("update-taxonomy failed")
+                else:
+                    entries = scan_dir(out_dir)  # update-taxonomy just wrote new files
+                    f2 = find_first(out_dir, TAXONOMY_NAMES, entries)
+                    st.success("Applied approvals to taxonomy.")
+                    if f2 and not show_table(f2, "taxonomy_json_updated", f"dl_tax_applied_{out_dir.name}"):
+                        st.json(read_json(f2))
+
+            # Run Chunk & Tag directly from this tab (uses effective taxonomy if present)
+            st.markdown("---")
+            effective_ct = out_dir / "effective_taxonomy.json"
+            input_meeting = out_dir / "input_meeting.json"
+            has_effective = "effective_taxonomy.json" in entries
+            disabled_ct = not (has_effective and "input_meeting.json" in entries)
+            if st.button("Run Chunk & Tag now", key=f"chunk_now_{out_dir.name}", disabled=disabled_ct):
+                log_ph = st.empty()
+                rc_c, out_c, err_c = run_cli([
+                    "python", str(REPO_ROOT / "run.py"),
+                    "chunk-tag",
+                    "--meeting", str(input_meeting),
+                    "--taxonomy", str(effective_ct if has_effective else DEFAULT_TAXONOMY),
+                    "--out", str(out_dir),
+                ], log_ph)
+                show_logs(out_dir, "chunk-tag", out_c, err_c)
+                if rc_c != 0:
+                    st.error("chunk-tag failed")
+                else:
+                    st.success("Chunk & Tag completed.")
+            if disabled_ct:
+                st.caption("Tip: Apply approvals to create effective_taxonomy.json, then run Chunk & Tag.")
 
     with t3:
-        f = find_first(out_dir, ["mentions.json", "chunk_mentions.json"])
+        f = find_first(out_dir, MENTIONS_NAMES, entries)
         data = read_json(f) if f else None
         if data is None:
             st.info("No mentions file found.")
-        else:
+        elif not show_table(f, "mentions", f"dl_mentions_{scope}_{out_dir.name}"):
             st.json(data)
 
     with t4:
-        # compute or show scores using CLI aggregator
-        rc4, out4, err4 = run_cli([
-            "python", str(REPO_ROOT / "run.py"),
-            "score-topics",
-            "--mentions", str(out_dir),
-            "--out", str(out_dir)
-        ])
-        with st.expander("stdout (score-topics)"):
-            st.code(out4 or "")
-        with st.expander("stderr (score-topics)"):
-            st.code(err4 or "")
-        scores_path = out_dir / "topic_scores.json"
-        data = read_json(scores_path)
-        if not data:
-            st.info("No topic_scores.json found.")
-        else:
-            st.json(data)
+        # Only run the CLI aggregator on request; otherwise show the last computed scores
+        if interactive and st.button("Compute/refresh scores", key=f"score_{out_dir.name}"):
+            log_ph = st.empty()
+            rc4, out4, err4 = run_cli([
+                "python", str(REPO_ROOT / "run.py"),
+                "score-topics",
+                "--mentions", str(out_dir),
+                "--out", str(out_dir)
+            ], log_ph)
+            show_logs(out_dir, "score-topics", out4, err4)
+            if rc4 != 0:
+                st.error("score-topics failed")
+        st.json(read_json(out_dir / "topic_scores.json") or {"_info": "not computed"})
+
+
+if results_dir:
+    st.subheader("Results")
+    render_artifact_tabs(results_dir)
 
 st.sidebar.markdown("---")
 st.sidebar.subheader("Browse existing runs")
-existing = sorted([p for p in RUNS_DIR.iterdir() if p.is_dir()], reverse=True)
-sel = st.sidebar.selectbox("Pick a run to view", [""] + [p.name for p in existing])
+existing = _list_runs(RUNS_DIR.stat().st_mtime_ns)
+sel = st.sidebar.selectbox("Pick a run to view", [""] + existing)
 
 if sel:
     out_dir = RUNS_DIR / sel
     st.write(f"**Viewing:** `{out_dir}`")
-    t1, t2, t3, t4 = st.tabs(["New Topics", "Updated Taxonomy", "Mentions", "Scores"]) 
-    with t1:
-        f = find_first(out_dir, ["new_topics.json", "new-topics.json"])
-        st.json(read_json(f) if f else {"_info": "not found"})
-    with t2:
-        f = find_first(out_dir, ["taxonomy_updated.json", "taxonomy.json", "taxonomy_json_updated.json"])
-        st.json(read_json(f) if f else {"_info": "not found"})
-    with t3:
-        f = find_first(out_dir, ["mentions.json", "chunk_mentions.json"])
-        st.json(read_json(f) if f else {"_info": "not found"})
-    with t4:
-        scores_path = out_dir / "topic_scores.json"
-        st.json(read_json(scores_path) if scores_path.exists() else {"_info": "not found"})
-
-
+    render_artifact_tabs(out_dir, interactive=False)
@@ -1,10 +1,15 @@
-import json
+import asyncio
+import contextlib
+import io
 import os
+import shutil
 import time
-import subprocess
+import traceback
 from pathlib import Path
 from typing import Dict, Any, List
 
+import orjson
+import pyarrow as pa
 import streamlit as st
 import pandas as pd
 
@@ -12,12 +17,15 @@ import pandas as pd
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from run import run_pipeline
+from pipeline import llm
 from pipeline.db import (
     get_topics, get_topic_aliases, get_topic_relations, get_pending_candidates,
     approve_candidate, reject_candidate, merge_candidate, get_mentions,
     get_latest_scores, start_scoring_run, write_topic_scores,
-    insert_session, insert_speaker, insert_utterances, insert_chunks,
-    insert_candidates, insert_mentions, upsert_topic, add_alias
+    insert_session, insert_speakers, insert_utterances, insert_chunks,
+    insert_candidates, insert_mentions, upsert_topics, add_aliases,
+    get_client, set_client
 )
 
 st.set_page_config(page_title="Signals POC - Supabase", layout="wide")
@@ -26,37 +34,130 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_MEETING = REPO_ROOT / "data" / "sample_meeting_real.json"
 DEFAULT_TAXONOMY = REPO_ROOT / "data" / "base_taxonomy.json"
 
+
+@st.cache_resource
+def _sb_client():
+    # One client per server process: its HTTP connection pool survives reruns
+    # and script reloads instead of being rebuilt with pipeline.db's module state.
+    return get_client()
+
+
+set_client(_sb_client())
+
 # Persist currently active run dir across reruns so UI doesn't collapse
 if "active_run_dir" not in st.session_state:
     st.session_state["active_run_dir"] = None
 
 
 def save_upload(uploaded_file, path: Path):
-    path.write_bytes(uploaded_file.getbuffer())
+    # Stream in 1 MB blocks rather than materialising a second copy of the upload
+    uploaded_file.seek(0)
+    with path.open("wb") as fh:
+        shutil.copyfileobj(uploaded_file, fh, 1 << 20)
 
 
-def run_cli(args):
-    """Run our existing CLI so we don't reimplement pipeline logic here."""
-    proc = subprocess.run(args, capture_output=True, text=True)
-    return proc.returncode, proc.stdout, proc.stderr
+def run_in_process(**kwargs):
+    """Run the CLI pipeline in this process, capturing its output like a subprocess would."""
+    # A fresh interpreter would pick up sidebar config from the environment
+    llm.MODEL = os.environ.get("OPENAI_MODEL", llm.MODEL)
+    if llm._client is not None and llm._client.api_key != os.environ.get("OPENAI_API_KEY"):
+        llm._client = None
+    out, err = io.StringIO(), io.StringIO()
+    rc = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            run_pipeline(**kwargs)
+        except SystemExit as e:
+            rc = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            rc = 1
+    return rc, out.getvalue(), err.getvalue()
 
 
 def read_json(path: Path):
-    if not path.exists():
-        return None
+    # EAFP: one open() instead of a stat followed by an open
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
     except Exception as e:
         return {"_error": f"Failed to read {path.name}: {e}"}
 
 
-def find_first(out_dir: Path, candidates):
-    for name in candidates:
-        p = out_dir / name
-        if p.exists():
-            return p
-    return None
+def to_table(rows: List[Dict[str, Any]], columns: List[str] | None = None):
+    """Build an Arrow table for st.dataframe, skipping the object-dtype DataFrame.
+
+    Rows whose values can't be given one Arrow type per column (mixed jsonb
+    payloads) fall back to pandas.
+    """
+    try:
+        table = pa.Table.from_pylist(rows)
+        return table.select(columns) if columns else table
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = pd.DataFrame(rows)
+        return df[columns] if columns else df
+
+
+async def ingest_run(session_id, utterances, topic_rows, alias_rows, candidates, mentions):
+    """Write one run's rows, overlapping the requests that don't depend on each other.
+
+    The db helpers are synchronous, so each independent branch runs in a worker
+    thread. Aliases and mentions reference topics(id), so that branch stays ordered.
+    """
+    async def taxonomy_then_mentions():
+        await asyncio.to_thread(upsert_topics, topic_rows)
+        await asyncio.to_thread(add_aliases, alias_rows)
+        await asyncio.to_thread(insert_mentions, mentions)
+
+    jobs = [taxonomy_then_mentions()]
+    if utterances:
+        jobs.append(asyncio.to_thread(insert_utterances, utterances))
+    if candidates:
+        jobs.append(asyncio.to_thread(insert_candidates, session_id, candidates))
+    await asyncio.gather(*jobs)
+
+
+# Cached reads: every widget interaction reruns the whole script, so without
+# these each slider move re-queries PostgREST for every tab. st.cache_data is
+# shared by every session in the process, so our own writes clear the affected
+# caches directly; the TTL bounds staleness from writes made elsewhere.
+READ_TTL_S = 30
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _topics():
+    return get_topics()
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _aliases():
+    return get_topic_aliases()
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _relations():
+    return get_topic_relations()
+
+
+def clear_taxonomy_cache():
+    for cached in (_topics, _aliases, _relations):
+        cached.clear()
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _pending():
+    return get_pending_candidates()
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _mentions(session_id: str | None, topic_id: str | None):
+    return get_mentions(session_id=session_id, topic_id=topic_id)
+
+
+@st.cache_data(ttl=READ_TTL_S, show_spinner=False)
+def _latest_scores():
+    return get_latest_scores()
 
 
 # Sidebar configuration
@@ -102,30 +203,28 @@ with tab1:
         temp_dir = Path(f"/tmp/signals_run_{run_name}")
         temp_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write inputs
-        meeting_path = temp_dir / "input_meeting.json"
-        taxonomy_path = temp_dir / "input_taxonomy.json"
+        # Write uploaded inputs; the samples are read in place rather than copied
+        meeting_path = DEFAULT_MEETING
+        taxonomy_path = DEFAULT_TAXONOMY
 
         if meeting_up is not None:
+            meeting_path = temp_dir / "input_meeting.json"
             save_upload(meeting_up, meeting_path)
-        else:
-            meeting_path.write_bytes(DEFAULT_MEETING.read_bytes())
 
         if tax_up is not None:
+            taxonomy_path = temp_dir / "input_taxonomy.json"
             save_upload(tax_up, taxonomy_path)
-        else:
-            taxonomy_path.write_bytes(DEFAULT_TAXONOMY.read_bytes())
 
         # Run the pipeline
         with st.spinner("Running pipeline..."):
-            returncode, stdout, stderr = run_cli([
-                "python", "run.py",
-                "--meeting", str(meeting_path),
-                "--taxonomy", str(taxonomy_path),
-                "--out-dir", str(temp_dir),
-                "--auto-approve" if auto_approve else "",
-                "--merge-threshold", str(merge_thr)
-            ])
+            returncode, stdout, stderr = run_in_process(
+                meeting=meeting_path,
+                taxonomy=taxonomy_path,
+                out_dir=temp_dir,
+                auto_approve=auto_approve,
+                merge_threshold=merge_thr,
+                default_score=default_score,
+            )
 
         if returncode == 0:
             st.success("Pipeline completed successfully!")
@@ -148,20 +247,22 @@ with tab1:
                 session_id = insert_session(session_data)
                 st.info(f"Session created: {session_id}")
                 
-                # Insert speakers
-                speaker_map = {}
-                for speaker_info in meeting_data.get("speakers", []):
-                    speaker_data = {
+                # Insert speakers (one bulk insert; ids come back in the response)
+                speaker_rows = [
+                    {
                         "display_name": speaker_info.get("name", "Unknown"),
                         "email": speaker_info.get("email"),
                         "is_internal": speaker_info.get("is_internal", False),
                         "org": speaker_info.get("org"),
                         "meta_json": speaker_info
                     }
-                    speaker_id = insert_speaker(speaker_data)
-                    speaker_map[speaker_info.get("name", "Unknown")] = speaker_id
+                    for speaker_info in meeting_data.get("speakers", [])
+                ]
+                speaker_map = {}
+                if speaker_rows:
+                    speaker_map = {r["display_name"]: r["speaker_id"] for r in insert_speakers(speaker_rows)}
                 
-                # Insert utterances
+                # Build every remaining batch up front, then send them concurrently
                 utterances = []
                 for utterance in meeting_data.get("utterances", []):
                     speaker_name = utterance.get("speaker", "Unknown")
@@ -176,53 +277,50 @@ with tab1:
                         }
                         utterances.append(utterance_data)
                 
-                if utterances:
-                    insert_utterances(utterances)
-                    st.info(f"Inserted {len(utterances)} utterances")
-                
-                # Insert taxonomy topics
+                # Taxonomy topics (input may be a bare list, as in data/base_taxonomy.json)
+                topic_rows, alias_rows = [], []
                 if taxonomy_data:
-                    for topic in taxonomy_data.get("topics", []):
-                        upsert_topic(
-                            topic_id=topic.get("id", topic.get("label")),
-                            label=topic.get("label", ""),
-                            description=topic.get("description"),
-                            created_by="pipeline"
-                        )
-                        for alias in topic.get("aliases", []):
-                            add_alias(alias, topic.get("id", topic.get("label")))
+                    tax_topics = taxonomy_data.get("topics", []) if isinstance(taxonomy_data, dict) else taxonomy_data
+                    for topic in tax_topics:
+                        topic_id = topic.get("id", topic.get("label"))
+                        topic_rows.append({
+                            "id": topic_id,
+                            "label": topic.get("label") or topic_id,
+                            "description": topic.get("description"),
+                            "created_by": "pipeline"
+                        })
+                        alias_rows.extend({"alias": alias, "topic_id": topic_id} for alias in topic.get("aliases", []))
                 
-                # Insert candidates if they exist
-                candidates_file = temp_dir / "new_topics.json"
-                if candidates_file.exists():
-                    candidates_data = read_json(candidates_file)
-                    candidates = candidates_data.get("new_topics", [])
-                    if candidates:
-                        insert_candidates(session_id, candidates)
-                        st.info(f"Inserted {len(candidates)} candidates")
+                # Candidates if they exist
+                candidates_data = read_json(temp_dir / "new_topics.json") or {}
+                candidates = candidates_data.get("new_topics", [])
                 
-                # Insert mentions if they exist
-                mentions_file = temp_dir / "mentions.json"
-                if mentions_file.exists():
-                    mentions_data = read_json(mentions_file)
-                    mentions = mentions_data.get("mentions", [])
-                    if mentions:
-                        # Convert mentions to database format
-                        db_mentions = []
-                        for mention in mentions:
-                            mention_data = {
-                                "session_id": session_id,
-                                "chunk_id": mention.get("chunk_id"),  # Would need proper mapping
-                                "topic_id": mention.get("topic_id"),
-                                "evidence": mention.get("evidence", ""),
-                                "surface_term": mention.get("surface_term"),
-                                "relevance_r": mention.get("relevance"),
-                                "created_at": meeting_data.get("started_at") or time.strftime("%Y-%m-%dT%H:%M:%S")
-                            }
-                            db_mentions.append(mention_data)
-                        
-                        insert_mentions(db_mentions)
-                        st.info(f"Inserted {len(db_mentions)} mentions")
+                # Mentions if they exist, converted to database format
+                db_mentions = []
+                mentions_data = read_json(temp_dir / "mentions.json") or {}
+                for mention in mentions_data.get("mentions", []):
+                    mention_data = {
+                        "session_id": session_id,
+                        "chunk_id": mention.get("chunk_id"),  # Would need proper mapping
+                        "topic_id": mention.get("topic_id"),
+                        "evidence": mention.get("evidence", ""),
+                        "surface_term": mention.get("surface_term"),
+                        "relevance_r": mention.get("relevance"),
+                        "created_at": meeting_data.get("started_at") or time.strftime("%Y-%m-%dT%H:%M:%S")
+                    }
+                    db_mentions.append(mention_data)
+                
+                asyncio.run(ingest_run(session_id, utterances, topic_rows, alias_rows, candidates, db_mentions))
+                if utterances:
+                    st.info(f"Inserted {len(utterances)} utterances")
+                if candidates:
+                    st.info(f"Inserted {len(candidates)} candidates")
+                if db_mentions:
+                    st.info(f"Inserted {len(db_mentions)} mentions")
+
+                clear_taxonomy_cache()
+                for cached in (_pending, _mentions):
+                    cached.clear()
         else:
             st.error(f"Pipeline failed with return code {returncode}")
             st.text("STDOUT:")
@@ -233,12 +331,16 @@ with tab1:
 with tab2:
     st.header("New Topic Candidates")
     
-    candidates = get_pending_candidates()
+    candidates = _pending()
     
     if not candidates:
         st.info("No pending candidates found.")
     else:
         st.write(f"Found {len(candidates)} pending candidates")
+
+        # Same merge targets for every candidate: build them once, not per expander
+        topic_options = {t['label']: t['id'] for t in _topics()}
+        topic_labels = list(topic_options)
         
         for candidate in candidates:
             with st.expander(f"**{candidate['label']}** - {candidate['topic_id_suggested']}"):
@@ -248,7 +350,11 @@ with tab2:
                     st.write(f"**Evidence:** {candidate['evidence']}")
                     if candidate.get('why_new'):
                         st.write(f"**Why new:** {candidate['why_new']}")
-                    st.write(f"**Session:** {candidate['session_id']}")
+                    session_title = (candidate.get('sessions') or {}).get('title')
+                    if session_title:
+                        st.write(f"**Session:** {session_title} ({candidate['session_id']})")
+                    else:
+                        st.write(f"**Session:** {candidate['session_id']}")
                     st.write(f"**Created:** {candidate['created_at']}")
                 
                 with col2:
@@ -261,24 +367,24 @@ with tab2:
                             candidate['topic_id_suggested'],
                             candidate['label']
                         )
+                        clear_taxonomy_cache()
+                        _pending.clear()
                         st.success("Candidate approved!")
                         st.rerun()
                     
                     # Reject button
                     if st.button("Reject", key=f"reject_{candidate['candidate_id']}"):
                         reject_candidate(candidate['candidate_id'])
+                        _pending.clear()
                         st.success("Candidate rejected!")
                         st.rerun()
                     
                     # Merge option
                     st.write("**Merge into:**")
-                    topics = get_topics()
-                    topic_options = {t['label']: t['id'] for t in topics}
-                    
                     if topic_options:
                         selected_topic = st.selectbox(
                             "Select topic to merge into:",
-                            options=list(topic_options.keys()),
+                            options=topic_labels,
                             key=f"merge_{candidate['candidate_id']}"
                         )
                         
@@ -288,6 +394,8 @@ with tab2:
                                 candidate['label'],
                                 topic_options[selected_topic]
                             )
+                            clear_taxonomy_cache()
+                            _pending.clear()
                             st.success("Candidate merged!")
                             st.rerun()
 
@@ -296,31 +404,28 @@ with tab3:
     
     # Topics
     st.subheader("Topics")
-    topics = get_topics()
+    topics = _topics()
     
     if topics:
-        topics_df = pd.DataFrame(topics)
-        st.dataframe(topics_df[['id', 'label', 'description', 'created_at']], use_container_width=True)
+        st.dataframe(to_table(topics, ['id', 'label', 'description', 'created_at']), use_container_width=True)
     else:
         st.info("No topics found.")
     
     # Aliases
     st.subheader("Topic Aliases")
-    aliases = get_topic_aliases()
+    aliases = _aliases()
     
     if aliases:
-        aliases_df = pd.DataFrame(aliases)
-        st.dataframe(aliases_df[['alias', 'topic_id', 'created_at']], use_container_width=True)
+        st.dataframe(to_table(aliases, ['alias', 'topic_id', 'created_at']), use_container_width=True)
     else:
         st.info("No aliases found.")
     
     # Relations
     st.subheader("Topic Relations")
-    relations = get_topic_relations()
+    relations = _relations()
     
     if relations:
-        relations_df = pd.DataFrame(relations)
-        st.dataframe(relations_df, use_container_width=True)
+        st.dataframe(to_table(relations), use_container_width=True)
     else:
         st.info("No relations found.")
 
@@ -334,14 +439,13 @@ with tab4:
     with col2:
         topic_filter = st.text_input("Filter by Topic ID (optional)")
     
-    mentions = get_mentions(
-        session_id=session_filter if session_filter else None,
-        topic_id=topic_filter if topic_filter else None
+    mentions = _mentions(
+        session_filter if session_filter else None,
+        topic_filter if topic_filter else None
     )
     
     if mentions:
-        mentions_df = pd.DataFrame(mentions)
-        st.dataframe(mentions_df, use_container_width=True)
+        st.dataframe(to_table(mentions), use_container_width=True)
     else:
         st.info("No mentions found.")
 
@@ -373,6 +477,7 @@ with tab5:
             }
             
             run_id = start_scoring_run(run_config)
+            _latest_scores.clear()
             st.success(f"Scoring run started: {run_id}")
             
             # TODO: Actually run the scoring algorithm here
@@ -381,10 +486,9 @@ with tab5:
     
     # Show latest scores
     st.subheader("Latest Scores")
-    scores = get_latest_scores()
+    scores = _latest_scores()
     
     if scores:
-        scores_df = pd.DataFrame(scores)
-        st.dataframe(scores_df, use_container_width=True)
+        st.dataframe(to_table(scores), use_container_width=True)
     else:
         st.info("No scores found.")
@@ -1,7 +1,16 @@
+import atexit
 import os
+import queue
+import sys
+import threading
+import time
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+import httpx
+from postgrest import APIError
 from supabase import create_client, Client
+from cachetools import TTLCache, cached
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 
 def get_client() -> Client:
@@ -12,18 +21,75 @@ def get_client() -> Client:
     return create_client(url, key)
 
 
-# Global client instance
+# Global client instance, shared by every call (and thread) so they reuse one connection pool
 sb = None
+_sb_lock = threading.Lock()
 
 
 def supa() -> Client:
     """Get singleton Supabase client."""
     global sb
     if sb is None:
-        sb = get_client()
+        # Backfill workers can all hit the first call at once; build only one client
+        with _sb_lock:
+            if sb is None:
+                sb = get_client()
     return sb
 
 
+def set_client(client: Client):
+    """Use an externally owned client (e.g. one cached by the Streamlit app) for all calls."""
+    global sb
+    sb = client
+
+
+def _chunked(rows: List[Dict[str, Any]], n: int = 500):
+    """Yield successive slices of at most n rows (keeps request bodies under PostgREST limits)."""
+    for i in range(0, len(rows), n):
+        yield rows[i:i + n]
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Network blips, gateway 5xx and Postgres connection/resource errors."""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, APIError):
+        code = str(exc.code or "")
+        # HTTP 5xx (non-JSON gateway errors), PostgREST PGRST00x = can't reach the DB,
+        # SQLSTATE 08/53/57 = connection, insufficient resources, operator intervention
+        return (len(code) == 3 and code.startswith("5")) or code.startswith(("PGRST00", "08", "53", "57"))
+    return False
+
+
+def _was_not_sent(exc: BaseException) -> bool:
+    """True only if the request can't have reached the DB, so re-sending can't duplicate rows."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    return isinstance(exc, APIError) and str(exc.code or "").startswith("PGRST00")
+
+
+_retry_transient = retry(
+    stop=stop_after_attempt(4), wait=wait_exponential(min=0.5, max=8),
+    retry=retry_if_exception(_is_transient), reraise=True,
+)
+_retry_unsent = retry(
+    stop=stop_after_attempt(4), wait=wait_exponential(min=0.5, max=8),
+    retry=retry_if_exception(_was_not_sent), reraise=True,
+)
+
+
+@_retry_transient
+def _execute(query):
+    """Execute an idempotent request (read or upsert), retrying transient failures."""
+    return query.execute()
+
+
+@_retry_unsent
+def _execute_insert(query):
+    """Execute a plain insert; retried only when it never reached the server."""
+    return query.execute()
+
+
 # Topic operations
 def upsert_topic(topic_id: str, label: str, description: str | None = None, created_by: str = "system"):
     """Create or update a topic."""
@@ -33,6 +99,14 @@ def upsert_topic(topic_id: str, label: str, description: str | None = None, crea
         "description": description, 
         "created_by": created_by
     }).execute()
+    clear_topic_cache()
+
+
+def upsert_topics(rows: List[Dict[str, Any]]):
+    """Create or update many topics; each row: {id, label, description, created_by}."""
+    for batch in _chunked(rows):
+        _execute(supa().table("topics").upsert(batch))
+    clear_topic_cache()
 
 
 def add_alias(alias: str, topic_id: str):
@@ -41,6 +115,21 @@ def add_alias(alias: str, topic_id: str):
         "alias": alias, 
         "topic_id": topic_id
     }).execute()
+    clear_topic_cache()
+
+
+def add_aliases(rows: List[Dict[str, Any]]):
+    """Add many aliases; each row: {alias, topic_id}."""
+    for batch in _chunked(rows):
+        _execute_insert(supa().table("topic_aliases").insert(batch))
+    clear_topic_cache()
+
+
+def upsert_aliases(rows: List[Dict[str, Any]]):
+    """Add or re-point many aliases (alias text is unique); each row: {alias, topic_id}."""
+    for batch in _chunked(rows):
+        _execute(supa().table("topic_aliases").upsert(batch, on_conflict="alias"))
+    clear_topic_cache()
 
 
 def add_parent_child(parent_id: str, child_id: str, rollup_weight: float | None = None):
@@ -53,18 +142,34 @@ def add_parent_child(parent_id: str, child_id: str, rollup_weight: float | None
     }).execute()
 
 
+# Topics and aliases are re-read constantly and change rarely. Cache each for 30s;
+# the write helpers below clear it so a process always sees its own writes.
+_topic_reads_lock = threading.Lock()
+
+
+@cached(TTLCache(maxsize=1, ttl=30), lock=_topic_reads_lock)
+@_retry_transient
 def get_topics() -> List[Dict[str, Any]]:
     """Get all active topics."""
     response = supa().table("topics").select("*").eq("status", "active").execute()
     return response.data
 
 
+@cached(TTLCache(maxsize=1, ttl=30), lock=_topic_reads_lock)
+@_retry_transient
 def get_topic_aliases() -> List[Dict[str, Any]]:
     """Get all topic aliases."""
     response = supa().table("topic_aliases").select("*").execute()
     return response.data
 
 
+def clear_topic_cache():
+    """Drop cached get_topics/get_topic_aliases results (call after writing topics or aliases)."""
+    get_topics.cache_clear()
+    get_topic_aliases.cache_clear()
+
+
+@_retry_transient
 def get_topic_relations() -> List[Dict[str, Any]]:
     """Get all topic relations."""
     response = supa().table("topic_relations").select("*").execute()
@@ -83,7 +188,8 @@ def insert_candidates(session_id: str, candidates: List[Dict[str, Any]]):
             "evidence": c["evidence"],
             "why_new": c.get("why_new", "")
         })
-    supa().table("topic_candidates").insert(rows).execute()
+    for batch in _chunked(rows):
+        _execute_insert(supa().table("topic_candidates").insert(batch))
 
 
 def approve_candidate(candidate_id: str, topic_id: str, label: str, description: str | None = None, approver: str = "system"):
@@ -117,9 +223,10 @@ def merge_candidate(candidate_id: str, alias_text: str, into_topic_id: str, appr
     }).eq("candidate_id", candidate_id).execute()
 
 
+@_retry_transient
 def get_pending_candidates() -> List[Dict[str, Any]]:
-    """Get all pending candidates."""
-    response = supa().table("topic_candidates").select("*").eq("status", "pending").execute()
+    """Get all pending candidates, each with its session's title embedded under "sessions"."""
+    response = supa().table("topic_candidates").select("*, sessions(title)").eq("status", "pending").execute()
     return response.data
 
 
@@ -136,14 +243,24 @@ def insert_speaker(speaker_data: Dict[str, Any]) -> str:
     return response.data[0]["speaker_id"]
 
 
+def insert_speakers(speakers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert multiple speakers and return the inserted rows (in input order)."""
+    inserted = []
+    for batch in _chunked(speakers):
+        inserted.extend(_execute_insert(supa().table("speakers").insert(batch)).data)
+    return inserted
+
+
 def insert_utterances(utterances: List[Dict[str, Any]]):
     """Insert multiple utterances."""
-    supa().table("utterances").insert(utterances).execute()
+    for batch in _chunked(utterances):
+        _execute_insert(supa().table("utterances").insert(batch))
 
 
 def insert_chunks(chunks: List[Dict[str, Any]]):
     """Insert multiple chunks."""
-    supa().table("chunks").insert(chunks).execute()
+    for batch in _chunked(chunks):
+        _execute_insert(supa().table("chunks").insert(batch))
 
 
 # Mention operations
@@ -151,9 +268,11 @@ def insert_mentions(rows: List[Dict[str, Any]]):
     """Insert mentions with required fields."""
     # rows must include: session_id, chunk_id, topic_id, evidence, created_at,
     # and optionally: surface_term, is_alias, relevance_r, importance_i, specificity_s, sentiment_tag
-    supa().table("mentions").insert(rows).execute()
+    for batch in _chunked(rows):
+        _execute_insert(supa().table("mentions").insert(batch))
 
 
+@_retry_transient
 def get_mentions(session_id: str | None = None, topic_id: str | None = None) -> List[Dict[str, Any]]:
     """Get mentions with optional filtering."""
     query = supa().table("mentions").select("*")
@@ -175,32 +294,128 @@ def start_scoring_run(cfg: Dict[str, Any]) -> str:
 def write_topic_scores(run_id: str, scores: List[Dict[str, Any]]):
     """Write topic scores for a scoring run."""
     # each: {topic_id, direct_score, rollup_score, total_score, num_mentions, last_mention_at}
-    for row in scores:
-        row["run_id"] = run_id
-    supa().table("topic_scores").upsert(scores).execute()
+    rows = [{**row, "run_id": run_id} for row in scores]
+    for batch in _chunked(rows):
+        _execute(supa().table("topic_scores").upsert(batch, on_conflict="run_id,topic_id"))
 
 
+@_retry_transient
 def get_latest_scores(limit: int = 50) -> List[Dict[str, Any]]:
     """Get the latest topic scores."""
-    # Get the most recent scoring run
-    latest_run = supa().table("scoring_runs").select("run_id").order("run_at", desc=True).limit(1).execute()
-    if not latest_run.data:
-        return []
-    
-    run_id = latest_run.data[0]["run_id"]
-    
-    # Get scores for that run
-    response = supa().table("topic_scores").select("*").eq("run_id", run_id).order("total_score", desc=True).limit(limit).execute()
+    # latest_topic_scores (migration 0003) resolves the most recent run server-side
+    response = supa().table("latest_topic_scores").select("*").order("total_score", desc=True).limit(limit).execute()
     return response.data
 
 
 # Utility functions
+_EVENT_COLUMNS = frozenset({"session_id", "topic_id", "candidate_id", "run_id"})
+
+
+# Audit events are written off the caller's path: log_event enqueues, and a daemon
+# thread drains the queue in batched inserts. flush_events() waits for the backlog
+# (and runs at exit so a script's last events aren't lost).
+_EVENT_QUEUE: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10_000)
+_EVENT_BATCH = 500
+_EVENT_WAIT_S = 0.1
+_event_thread: threading.Thread | None = None
+_event_thread_lock = threading.Lock()
+# Rows that failed even on their own; only the first few errors are kept
+_EVENT_ERRORS_MAX = 20
+_event_errors: List[BaseException] = []
+_event_failed = 0
+_event_errors_lock = threading.Lock()
+
+
+def _insert_events(batch: List[Dict[str, Any]]):
+    try:
+        _execute_insert(supa().table("events").insert(batch))
+        return
+    except Exception:
+        if len(batch) == 1:
+            raise
+    # A batch can mix events from unrelated callers: retry row by row so one
+    # bad row doesn't take the rest down with it
+    for row in batch:
+        try:
+            _execute_insert(supa().table("events").insert(row))
+        except Exception as e:
+            _record_event_error(e)
+
+
+def _record_event_error(e: BaseException):
+    global _event_failed
+    with _event_errors_lock:
+        _event_failed += 1
+        if len(_event_errors) < _EVENT_ERRORS_MAX:
+            _event_errors.append(e)
+
+
+def _drain_events():
+    while True:
+        batch = [_EVENT_QUEUE.get()]
+        deadline = time.monotonic() + _EVENT_WAIT_S
+        while len(batch) < _EVENT_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_EVENT_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _insert_events(batch)
+        except Exception as e:
+            _record_event_error(e)
+        finally:
+            for _ in batch:
+                _EVENT_QUEUE.task_done()
+
+
+def _ensure_event_thread():
+    global _event_thread
+    if _event_thread is None:
+        with _event_thread_lock:
+            if _event_thread is None:
+                _event_thread = threading.Thread(target=_drain_events, name="event-logger", daemon=True)
+                _event_thread.start()
+
+
+def flush_events(timeout: float | None = 10.0):
+    """Wait until queued events are written; raise if any failed to write since the last flush."""
+    global _event_failed
+    with _EVENT_QUEUE.all_tasks_done:
+        done = _EVENT_QUEUE.all_tasks_done.wait_for(lambda: not _EVENT_QUEUE.unfinished_tasks, timeout)
+    with _event_errors_lock:
+        failed, errors = _event_failed, list(_event_errors)
+        _event_failed = 0
+        _event_errors.clear()
+    if failed:
+        raise RuntimeError(f"{failed} event(s) failed to write; first error: {errors[0]}") from errors[0]
+    if not done:
+        raise TimeoutError(f"{_EVENT_QUEUE.unfinished_tasks} events still queued after {timeout}s")
+
+
+@atexit.register
+def _flush_events_at_exit():
+    try:
+        flush_events()
+    except Exception as e:
+        print(f"⚠ failed to write queued events: {e}", file=sys.stderr)
+
+
 def log_event(event_type: str, actor: str = "system", **kwargs):
-    """Log an audit event."""
-    payload = {k: v for k, v in kwargs.items() if v is not None}
-    supa().table("events").insert({
-        "event_type": event_type,
-        "actor": actor,
-        "payload_json": payload,
-        **{k: v for k, v in kwargs.items() if k in ["session_id", "topic_id", "candidate_id", "run_id"]}
-    }).execute()
+    """Queue an audit event; it's written in the background (see flush_events)."""
+    # One pass: every non-None kwarg goes into the payload; the ones with their
+    # own events column are also set top-level (as before, even when None).
+    row = {"event_type": event_type, "actor": actor}
+    payload = {}
+    for k, v in kwargs.items():
+        if k in _EVENT_COLUMNS:
+            row[k] = v
+        if v is not None:
+            payload[k] = v
+    row["payload_json"] = payload
+    # Stamped now, not when the batch lands
+    row["occurred_at"] = datetime.now(timezone.utc).isoformat()
+    _ensure_event_thread()
+    _EVENT_QUEUE.put(row)
@@ -1,18 +1,31 @@
-import os, orjson
+import asyncio, functools, hashlib, os, orjson, uuid
+from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import BaseModel, ValidationError
-from typing import Any, Dict, Type, List
-from openai import OpenAI
+from typing import Any, Callable, Dict, Type, List, Tuple
+from openai import AsyncOpenAI, OpenAI
 
 
+PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
+
+# Prompts don't change while the process runs: skip Jinja's per-lookup mtime
+# check and never evict a compiled template.
 env = Environment(
-    loader=FileSystemLoader("prompts"),
-    autoescape=select_autoescape(disabled_extensions=("j2",))
+    loader=FileSystemLoader(PROMPTS_DIR),
+    autoescape=select_autoescape(disabled_extensions=("j2",)),
+    auto_reload=False,
+    cache_size=-1,
 )
 
 MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
 EMBED_MODEL = os.environ.get("OPENAI_EMBED_MODEL", "text-embedding-3-small")
+# Inputs per embeddings request (the API caps a single request at 2048)
+EMBED_BATCH = 1024
+
+# On-disk response cache so reruns over an unchanged meeting don't re-bill the API.
+# Keys include the model, so switching models naturally misses. Set to "" to disable.
+CACHE_DIR = os.environ.get("SIGNALS_LLM_CACHE", "~/.signals_llm_cache")
 
 _client = None
 
@@ -29,8 +42,51 @@ def get_openai_client() -> OpenAI:
     return _client
 
 
+def _cache_path(kind: str, *parts: str) -> Path | None:
+    if not CACHE_DIR:
+        return None
+    h = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=20).hexdigest()
+    return Path(CACHE_DIR).expanduser() / kind / h[:2] / f"{h}.json"
+
+
+def _cache_get(path: Path | None) -> bytes | None:
+    if path is None:
+        return None
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _cache_put(path: Path | None, data: bytes) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer: threads share a pid and may race on the same key
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # atomic: concurrent readers never see a partial file
+    except OSError:
+        pass
+
+
+def _cache_drop(path: Path | None) -> None:
+    if path is None:
+        return
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _get_template(template_name: str):
+    return env.get_template(template_name)
+
+
 def render(template_name: str, **vars) -> str:
-    return env.get_template(template_name).render(**vars)
+    return _get_template(template_name).render(**vars)
 
 
 def schema_wrapper(schema_name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -44,15 +100,23 @@ def schema_wrapper(schema_name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
-def call_json(
+def _chat_request(
     system_prompt: str,
     user_prompt: str,
     schema_name: str,
     schema: Dict[str, Any],
-) -> Dict[str, Any]:
-    client = get_openai_client()
-    resp = client.chat.completions.create(
+    cached_prefix: str | None,
+) -> Tuple[Dict[str, Any], Path | None]:
+    """Build chat.completions kwargs and the response-cache path for one call.
+
+    `cached_prefix` (the transcript/chunks block) is sent verbatim as the very
+    start of the prompt, ahead of the instructions. OpenAI caches prompt
+    prefixes, so reruns over the same meeting reuse it even when the taxonomy
+    or instructions after it change.
+    """
+    if cached_prefix:
+        system_prompt = f"{cached_prefix}\n\n{system_prompt}"
+    kwargs = dict(
         model=MODEL,
         messages=[
             {"role": "system", "content": system_prompt},
@@ -62,34 +126,195 @@ def call_json(
         temperature=0.2,
         top_p=1
     )
-    content = resp.choices[0].message.content
-    return orjson.loads(content)
+    return kwargs, _cache_path("chat", MODEL, schema_name, system_prompt, user_prompt)
 
 
-def call_and_validate(
-    system: str,
-    user: str,
+def _from_cache(cache_path: Path | None, parse: Callable[[str], Any]) -> Tuple[bool, Any]:
+    """Return (hit, parsed) for a cached completion; an entry that no longer parses is dropped."""
+    cached = _cache_get(cache_path)
+    if cached is None:
+        return False, None
+    try:
+        return True, parse(cached.decode("utf-8"))
+    except ValueError:
+        _cache_drop(cache_path)
+        return False, None
+
+
+def _finish_chat(resp, cache_path: Path | None, parse: Callable[[str], Any]) -> Any:
+    choice = resp.choices[0]
+    # Parse before caching so a malformed, invalid or truncated reply is never replayed
+    result = parse(choice.message.content)
+    if choice.finish_reason == "stop":
+        _cache_put(cache_path, choice.message.content.encode("utf-8"))
+    return result
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
+def _call_parsed(
+    system_prompt: str,
+    user_prompt: str,
     schema_name: str,
     schema: Dict[str, Any],
-    model_cls: Type[BaseModel]
-) -> BaseModel:
-    data = call_json(system, user, schema_name, schema)
+    cached_prefix: str | None,
+    parse: Callable[[str], Any],
+) -> Any:
+    """Chat completion constrained to `schema`, decoded by `parse`.
+
+    Parsing happens inside the retry, so a malformed or schema-invalid
+    completion gets the same three attempts as a failed request.
+    """
+    kwargs, cache_path = _chat_request(system_prompt, user_prompt, schema_name, schema, cached_prefix)
+    hit, result = _from_cache(cache_path, parse)
+    if hit:
+        return result
+    resp = get_openai_client().chat.completions.create(**kwargs)
+    return _finish_chat(resp, cache_path, parse)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
+async def _acall_parsed(
+    client: AsyncOpenAI,
+    system_prompt: str,
+    user_prompt: str,
+    schema_name: str,
+    schema: Dict[str, Any],
+    cached_prefix: str | None,
+    parse: Callable[[str], Any],
+) -> Any:
+    kwargs, cache_path = _chat_request(system_prompt, user_prompt, schema_name, schema, cached_prefix)
+    hit, result = _from_cache(cache_path, parse)
+    if hit:
+        return result
+    resp = await client.chat.completions.create(**kwargs)
+    return _finish_chat(resp, cache_path, parse)
+
+
+def call_json(
+    system_prompt: str,
+    user_prompt: str,
+    schema_name: str,
+    schema: Dict[str, Any],
+    cached_prefix: str | None = None,
+) -> Dict[str, Any]:
+    return _call_parsed(system_prompt, user_prompt, schema_name, schema, cached_prefix, orjson.loads)
+
+
+def _validate(content: str, model_cls: Type[BaseModel]) -> BaseModel:
     try:
-        return model_cls.model_validate(data)
+        # Parse straight into the model instead of building dicts first
+        return model_cls.model_validate_json(content)
     except ValidationError as e:
         # One retry via a looser parse: if assistant wrapped in {"content": "...json..."}
+        data = orjson.loads(content)
         if isinstance(data, dict) and "content" in data:
-            return model_cls.model_validate(orjson.loads(data["content"]))
+            return model_cls.model_validate_json(data["content"])
         raise e
 
 
+def call_and_validate(
+    system: str,
+    user: str,
+    schema_name: str,
+    schema: Dict[str, Any],
+    model_cls: Type[BaseModel],
+    cached_prefix: str | None = None,
+) -> BaseModel:
+    parse = functools.partial(_validate, model_cls=model_cls)
+    return _call_parsed(system, user, schema_name, schema, cached_prefix, parse)
+
+
+async def acall_and_validate(
+    client: AsyncOpenAI,
+    system: str,
+    user: str,
+    schema_name: str,
+    schema: Dict[str, Any],
+    model_cls: Type[BaseModel],
+    cached_prefix: str | None = None,
+) -> BaseModel:
+    """Async call_and_validate; `client` comes from get_async_openai_client() in the running loop."""
+    parse = functools.partial(_validate, model_cls=model_cls)
+    return await _acall_parsed(client, system, user, schema_name, schema, cached_prefix, parse)
+
+
+def _embed_cached(texts: List[str], m: str):
+    # Cached per text, so a rerun only embeds texts it hasn't seen with this model
+    paths = [_cache_path("embed", m, t) for t in texts]
+    out: List[List[float] | None] = []
+    for p in paths:
+        raw = _cache_get(p)
+        out.append(orjson.loads(raw) if raw is not None else None)
+    missing = [i for i, e in enumerate(out) if e is None]
+    return out, paths, missing
+
+
+def _embed_store(out, paths, missing, fresh) -> List[List[float]]:
+    for i, emb in zip(missing, fresh):
+        out[i] = emb
+        _cache_put(paths[i], orjson.dumps(emb))
+    return out
+
+
 def embed_texts(texts: List[str], model: str | None = None) -> List[List[float]]:
     """Return embeddings for a list of texts using OpenAI embeddings API."""
     if not texts:
         return []
-    client = get_openai_client()
     m = model or EMBED_MODEL
-    resp = client.embeddings.create(model=m, input=texts)
-    return [item.embedding for item in resp.data]
+    out, paths, missing = _embed_cached(texts, m)
+    if missing:
+        _embed_store(out, paths, missing, _embed_uncached([texts[i] for i in missing], m))
+    return out
+
+
+async def embed_texts_async(
+    texts: List[str],
+    model: str | None = None,
+    *,
+    batch: int = 256,
+    concurrency: int = 8,
+) -> List[List[float]]:
+    """embed_texts for use inside an event loop: uncached texts go out as
+    `batch`-sized requests, at most `concurrency` in flight at once."""
+    if not texts:
+        return []
+    m = model or EMBED_MODEL
+    out, paths, missing = _embed_cached(texts, m)
+    if missing:
+        todo = [texts[i] for i in missing]
+        batches = [todo[i:i + batch] for i in range(0, len(todo), batch)]
+        results = await _embed_batches(batches, m, concurrency)
+        _embed_store(out, paths, missing, [emb for b in results for emb in b])
+    return out
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """A new AsyncOpenAI client; create one per event loop (its pool is bound to the loop)."""
+    return AsyncOpenAI(api_key=get_openai_client().api_key)
+
+
+def _embed_uncached(texts: List[str], m: str) -> List[List[float]]:
+    batches = [texts[i:i + EMBED_BATCH] for i in range(0, len(texts), EMBED_BATCH)]
+    try:
+        asyncio.get_running_loop()
+        in_loop = True
+    except RuntimeError:
+        in_loop = False
+    if len(batches) == 1 or in_loop:
+        # asyncio.run() can't nest inside a running loop (async callers should
+        # use embed_texts_async); there we send the batches one after another
+        client = get_openai_client()
+        return [item.embedding for b in batches for item in client.embeddings.create(model=m, input=b).data]
+    # Oversize inputs: send every batch concurrently; gather keeps batch order
+    results = asyncio.run(_embed_batches(batches, m, len(batches)))
+    return [emb for batch in results for emb in batch]
 
 
+async def _embed_batches(batches: List[List[str]], model: str, concurrency: int) -> List[List[List[float]]]:
+    sem = asyncio.Semaphore(concurrency)
+    async with get_async_openai_client() as client:
+        async def one(batch):
+            async with sem:
+                resp = await client.embeddings.create(model=model, input=batch)
+            return [item.embedding for item in resp.data]
+        return await asyncio.gather(*(one(b) for b in batches))
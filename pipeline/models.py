@@ -1,6 +1,7 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from dataclasses import dataclass
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Any, Dict, List, Optional
 
 
 class TaxonomyItem(BaseModel):
@@ -19,6 +20,11 @@ class NewTopicResponse(BaseModel):
     new_topics: List[NewTopicCandidate] = Field(default_factory=list)
 
 
+# Validate a whole list in one pydantic-core call instead of one model per item
+TaxonomyList = TypeAdapter(List[TaxonomyItem])
+CandidateList = TypeAdapter(List[NewTopicCandidate])
+
+
 class Chunk(BaseModel):
     chunk_id: str
     speaker: str
@@ -26,6 +32,43 @@ class Chunk(BaseModel):
     text: str
 
 
+@dataclass
+class ChunkTable:
+    """Chunks stored column-wise: entry i of each field belongs to chunk i."""
+    ids: List[str]
+    speakers: List[str]
+    starts: List[Optional[str]]
+    texts: List[str]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def from_columns(cls, ids: List[str], speakers: List[str], starts: List[Optional[str]],
+                     texts: List[str]) -> "ChunkTable":
+        return cls(ids=ids, speakers=speakers, starts=starts, texts=texts)
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Chunk]) -> "ChunkTable":
+        return cls.from_columns(
+            [c.chunk_id for c in chunks], [c.speaker for c in chunks],
+            [c.start_time for c in chunks], [c.text for c in chunks],
+        )
+
+    def index(self) -> Dict[str, int]:
+        return {cid: i for i, cid in enumerate(self.ids)}
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Same shape as [c.model_dump() for c in chunks]."""
+        return [
+            {"chunk_id": cid, "speaker": spk, "start_time": start, "text": text}
+            for cid, spk, start, text in zip(self.ids, self.speakers, self.starts, self.texts)
+        ]
+
+    def to_chunks(self) -> List[Chunk]:
+        return [Chunk(**r) for r in self.records()]
+
+
 class Mention(BaseModel):
     chunk_id: str
     topic_id: Optional[str] = None
@@ -1,13 +1,33 @@
 from __future__ import annotations
 import os
-from typing import List, Dict, Any, Tuple, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Tuple, Optional
+import numpy as np
 from pydantic import BaseModel
 from .models import (
-    TaxonomyItem, Chunk, Mention, MentionsResponse,
+    TaxonomyItem, TaxonomyList, Chunk, ChunkTable, Mention, MentionsResponse,
     NewTopicResponse, NewTopicCandidate
 )
 from .utils import slugify, json_dump, chunk_hash, utc_now_iso, load_json
-from .llm import render, call_and_validate, embed_texts
+from .llm import render, call_and_validate, acall_and_validate, embed_texts, embed_texts_async
+
+# Optional SIMD cosine kernels (`pip install simsimd`), opt-in via SIGNALS_USE_SIMSIMD=1
+_simsimd = None
+if os.environ.get("SIGNALS_USE_SIMSIMD") == "1":
+    try:
+        import simsimd as _simsimd
+    except ImportError:
+        _simsimd = None
+
+# Optional FAISS top-1 search (`pip install faiss-cpu`), opt-in via SIGNALS_USE_FAISS=1.
+# Only used past FAISS_MIN_BASE base topics; below that the plain matmul is faster.
+_faiss = None
+if os.environ.get("SIGNALS_USE_FAISS") == "1":
+    try:
+        import faiss as _faiss
+    except ImportError:
+        _faiss = None
+FAISS_MIN_BASE = 2000
 
 
 # ---------- Schemas for LLM structured output ----------
@@ -63,71 +83,74 @@ def load_meeting(path: str) -> Dict[str, Any]:
     return load_json(path)
 
 
-def load_taxonomy(path: str) -> List[TaxonomyItem]:
+def _taxonomy_rows(path: str) -> List[Dict[str, Any]]:
     raw = load_json(path)
     if isinstance(raw, dict) and "taxonomy_json_updated" in raw:
         raw = raw["taxonomy_json_updated"]
-    return [TaxonomyItem(**t) for t in raw]
+    return raw
 
 
-def naive_chunks(meeting: Dict[str,Any]) -> List[Chunk]:
-    """Create chunks from meeting transcript.
+def load_taxonomy(path: str) -> List[TaxonomyItem]:
+    """Load a taxonomy this pipeline wrote itself (no validation, just construction)."""
+    return [TaxonomyItem.model_construct(**t) for t in _taxonomy_rows(path)]
+
+
+def load_taxonomy_validated(path: str) -> List[TaxonomyItem]:
+    """Load a taxonomy from outside the pipeline (uploads, --taxonomy), validating every item."""
+    return TaxonomyList.validate_python(_taxonomy_rows(path))
+
+
+def naive_chunks_soa(meeting: Dict[str,Any]) -> ChunkTable:
+    """Create chunks from meeting transcript as a column-wise ChunkTable.
 
     Supports both structured transcripts (list of {speaker,text,...}) and
     flat string transcripts (single large text) or list[str].
     """
-    out: List[Chunk] = []
+    ids: List[str] = []
+    speakers: List[str] = []
+    starts: List[Optional[str]] = []
+    texts: List[str] = []
+
+    def add(i: int, speaker, start_time, text: str) -> None:
+        ids.append(f"{i:08x}"[:8])
+        speakers.append(speaker)
+        starts.append(start_time)
+        texts.append(text)
+
     tr = meeting.get("transcript", "")
-    
+
     if isinstance(tr, str):
         text = tr.strip()
-        if not text:
-            return out
-            
-        # Try to parse HTML-formatted transcripts with timestamps and speakers
-        if "<br><p>" in text or "<p>" in text:
-            chunks = _parse_html_transcript(text)
-            for i, chunk_data in enumerate(chunks, start=1):
-                out.append(Chunk(
-                    chunk_id=f"{i:08x}"[:8],
-                    speaker=chunk_data.get("speaker", "unknown"),
-                    start_time=chunk_data.get("start_time"),
-                    text=chunk_data.get("text", "").strip()
-                ))
-        else:
-            # For plain text, create chunks by splitting on sentences
-            chunks = _split_text_into_chunks(text)
-            for i, chunk_text in enumerate(chunks, start=1):
-                if chunk_text.strip():
-                    out.append(Chunk(
-                        chunk_id=f"{i:08x}"[:8],
-                        speaker="unknown",
-                        start_time=meeting.get("start_time"),
-                        text=chunk_text.strip()
-                    ))
-        return out
+        if text:
+            # Try to parse HTML-formatted transcripts with timestamps and speakers
+            if "<br><p>" in text or "<p>" in text:
+                chunks = _parse_html_transcript(text)
+                for i, chunk_data in enumerate(chunks, start=1):
+                    add(i, chunk_data.get("speaker", "unknown"), chunk_data.get("start_time"),
+                        chunk_data.get("text", "").strip())
+            else:
+                # For plain text, create chunks by splitting on sentences
+                chunks = _split_text_into_chunks(text)
+                for i, chunk_text in enumerate(chunks, start=1):
+                    if chunk_text.strip():
+                        add(i, "unknown", meeting.get("start_time"), chunk_text.strip())
 
-    if isinstance(tr, list):
+    elif isinstance(tr, list):
         for i, row in enumerate(tr, start=1):
             if isinstance(row, dict):
-                out.append(Chunk(
-                    chunk_id=f"{i:08x}"[:8],
-                    speaker=row.get("speaker","unknown"),
-                    start_time=row.get("start_time"),
-                    text=str(row.get("text",""))[:100000].strip()
-                ))
+                add(i, row.get("speaker","unknown"), row.get("start_time"),
+                    str(row.get("text",""))[:100000].strip())
             else:
                 # treat as plain text element
-                out.append(Chunk(
-                    chunk_id=f"{i:08x}"[:8],
-                    speaker="unknown",
-                    start_time=None,
-                    text=str(row).strip()
-                ))
-        return out
+                add(i, "unknown", None, str(row).strip())
 
-    # Fallback: nothing usable
-    return out
+    # Anything else: nothing usable
+    return ChunkTable.from_columns(ids, speakers, starts, texts)
+
+
+def naive_chunks(meeting: Dict[str,Any]) -> List[Chunk]:
+    """naive_chunks_soa as a list of Chunk models."""
+    return naive_chunks_soa(meeting).to_chunks()
 
 
 def _parse_html_transcript(text: str) -> List[Dict[str, str]]:
@@ -250,16 +273,20 @@ def _transcript_to_text(meeting: Dict[str, Any]) -> str:
     return ""
 
 
-def detect_new_topics(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem]) -> NewTopicResponse:
+def _detect_prompts(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem]) -> Tuple[str, str, str]:
+    # Transcript goes first and byte-identical across runs so it hits the prompt cache
+    context = render("detect_new_topics_context.j2", transcript_text=_transcript_to_text(meeting))
     user = render(
         "detect_new_topics.j2",
         meeting_title=meeting.get("meeting_title",""),
         meeting_type=meeting.get("meeting_type",""),
         taxonomy_ids=[t.id for t in taxonomy],
-        transcript_text=_transcript_to_text(meeting)
     )
     system = "Return only valid JSON. Do not include existing taxonomy ids as new."
-    resp = call_and_validate(system, user, "NewTopicDetection", NEW_TOPICS_SCHEMA, NewTopicResponse)
+    return system, user, context
+
+
+def _slug_topic_ids(resp: NewTopicResponse) -> NewTopicResponse:
     # Ensure topic_id is present for all candidates
     for c in resp.new_topics:
         if not getattr(c, "topic_id", None):
@@ -269,14 +296,44 @@ def detect_new_topics(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem]) -> N
     return resp
 
 
-def chunk_and_tag(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem], chunks: List[Chunk]) -> MentionsResponse:
-    user = render(
-        "chunk_tag.j2",
-        taxonomy_ids=[t.id for t in taxonomy],
-        chunks_json=[c.model_dump() for c in chunks]
-    )
+def detect_new_topics(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem]) -> NewTopicResponse:
+    system, user, context = _detect_prompts(meeting, taxonomy)
+    resp = call_and_validate(system, user, "NewTopicDetection", NEW_TOPICS_SCHEMA, NewTopicResponse,
+                             cached_prefix=context)
+    return _slug_topic_ids(resp)
+
+
+async def detect_new_topics_async(client, meeting: Dict[str,Any], taxonomy: List[TaxonomyItem]) -> NewTopicResponse:
+    """detect_new_topics for drivers that gather over many meetings; `client` is an AsyncOpenAI."""
+    system, user, context = _detect_prompts(meeting, taxonomy)
+    resp = await acall_and_validate(client, system, user, "NewTopicDetection", NEW_TOPICS_SCHEMA, NewTopicResponse,
+                                    cached_prefix=context)
+    return _slug_topic_ids(resp)
+
+
+def _chunk_rows(chunks: List[Chunk] | ChunkTable) -> List[Dict[str, Any]]:
+    if isinstance(chunks, ChunkTable):
+        return chunks.records()
+    return [c.model_dump() for c in chunks]
+
+
+def _chunk_tag_prompts(taxonomy: List[TaxonomyItem], chunks: List[Chunk] | ChunkTable) -> Tuple[str, str, str]:
+    context = render("chunk_tag_context.j2", chunks_json=_chunk_rows(chunks))
+    user = render("chunk_tag.j2", taxonomy_ids=[t.id for t in taxonomy])
     system = "Return only mentions whose topic_label exactly matches an existing taxonomy id."
-    return call_and_validate(system, user, "ChunkTagging", MENTIONS_SCHEMA, MentionsResponse)
+    return system, user, context
+
+
+def chunk_and_tag(meeting: Dict[str,Any], taxonomy: List[TaxonomyItem], chunks: List[Chunk] | ChunkTable) -> MentionsResponse:
+    system, user, context = _chunk_tag_prompts(taxonomy, chunks)
+    return call_and_validate(system, user, "ChunkTagging", MENTIONS_SCHEMA, MentionsResponse,
+                             cached_prefix=context)
+
+
+async def chunk_and_tag_async(client, meeting: Dict[str,Any], taxonomy: List[TaxonomyItem], chunks: List[Chunk] | ChunkTable) -> MentionsResponse:
+    system, user, context = _chunk_tag_prompts(taxonomy, chunks)
+    return await acall_and_validate(client, system, user, "ChunkTagging", MENTIONS_SCHEMA, MentionsResponse,
+                                    cached_prefix=context)
 
 
 # ---------- Transform steps ----------
@@ -295,42 +352,137 @@ def update_taxonomy(base: List[TaxonomyItem], candidates: List[NewTopicCandidate
     return updated, added
 
 
+def _merge_texts(
+    base: List[TaxonomyItem],
+    candidates: List[NewTopicCandidate],
+    base_gloss_map: Dict[str, str] | None,
+) -> Tuple[List[str], List[str], List[str], List[int], List[str]]:
+    """Ids and embedding texts for a merge comparison.
+
+    Candidates whose id already exists in base are exact merges and never need
+    embedding; `pending` indexes the rest and `cand_texts` covers only those.
+    """
+    base_ids = [t.id for t in base]
+    base_texts = [
+        f"{tid} - {base_gloss_map.get(tid, '') if base_gloss_map else ''}".strip()
+        for tid in base_ids
+    ]
+    cand_ids = [slugify(getattr(c, 'topic_id', None) or c.label) for c in candidates]
+    base_set = set(base_ids)
+    pending = [i for i, cid in enumerate(cand_ids) if cid not in base_set]
+    cand_texts = [
+        f"{cand_ids[i]} - {(candidates[i].why_new or '')} | {(candidates[i].evidence or '')}".strip()
+        for i in pending
+    ]
+    return base_ids, base_texts, cand_ids, pending, cand_texts
+
+
+def embed_merge_inputs(
+    base: List[TaxonomyItem],
+    candidates: List[NewTopicCandidate],
+    *,
+    base_gloss_map: Dict[str, str] | None = None,
+) -> Tuple[List[List[float]], List[List[float]]]:
+    """Embed the texts suggest_merges* compare, so callers running both can embed once.
+
+    cand_vecs only covers candidates whose id isn't already a base id.
+    """
+    _, base_texts, _, _, cand_texts = _merge_texts(base, candidates, base_gloss_map)
+    return _embed_pair(base_texts, cand_texts)
+
+
+def _embed_pair(base_texts: List[str], cand_texts: List[str]) -> Tuple[List[List[float]], List[List[float]]]:
+    # One embeddings round-trip for both sides, split afterwards
+    if not cand_texts:
+        return [], []
+    vecs = embed_texts(base_texts + cand_texts)
+    return vecs[:len(base_texts)], vecs[len(base_texts):]
+
+
+async def embed_merge_inputs_async(
+    base: List[TaxonomyItem],
+    candidates: List[NewTopicCandidate],
+    *,
+    base_gloss_map: Dict[str, str] | None = None,
+) -> Tuple[List[List[float]], List[List[float]]]:
+    """embed_merge_inputs with the uncached texts sent as concurrent batches."""
+    _, base_texts, _, _, cand_texts = _merge_texts(base, candidates, base_gloss_map)
+    if not cand_texts:
+        return [], []
+    vecs = await embed_texts_async(base_texts + cand_texts)
+    return vecs[:len(base_texts)], vecs[len(base_texts):]
+
+
+async def suggest_merges_async(
+    base: List[TaxonomyItem],
+    candidates: List[NewTopicCandidate],
+    *,
+    base_gloss_map: Dict[str, str] | None = None,
+    threshold: float = 0.85,
+) -> List[Dict[str, Any]]:
+    if not candidates or not base:
+        return []
+    vectors = await embed_merge_inputs_async(base, candidates, base_gloss_map=base_gloss_map)
+    return suggest_merges(base, candidates, base_gloss_map=base_gloss_map, threshold=threshold, vectors=vectors)
+
+
+def _row_norms(X: np.ndarray) -> np.ndarray:
+    # One fused reduction + sqrt; cheaper than np.linalg.norm's generic dispatch
+    return np.sqrt(np.einsum("ij,ij->i", X, X)).clip(min=1e-12)[:, None]
+
+
+def _best_matches(base_vecs, cand_vecs) -> Tuple[np.ndarray, np.ndarray]:
+    """Index and cosine score of the closest base vector for every candidate vector.
+
+    One normalise + matmul instead of a Python loop per (candidate, base) pair.
+    Zero vectors score 0 against everything, like the old `norm or 1.0` guard.
+    """
+    if _faiss is not None and len(base_vecs) > FAISS_MIN_BASE:
+        return _faiss_best_matches(base_vecs, cand_vecs)
+    if _simsimd is not None:
+        B = np.asarray(base_vecs, dtype=np.float64)
+        C = np.asarray(cand_vecs, dtype=np.float64)
+        S = 1.0 - np.asarray(_simsimd.cdist(C, B, metric="cosine"))
+    else:
+        # Normalise both sides in one pass over the stacked matrix
+        V = np.asarray(list(base_vecs) + list(cand_vecs), dtype=np.float64)
+        V /= _row_norms(V)
+        B, C = V[:len(base_vecs)], V[len(base_vecs):]
+        S = C @ B.T
+    best_idx = S.argmax(axis=1)
+    return best_idx, S[np.arange(len(C)), best_idx]
+
+
+def _faiss_best_matches(base_vecs, cand_vecs) -> Tuple[np.ndarray, np.ndarray]:
+    # Inner product over unit vectors is cosine; IndexFlatIP is exact, in float32
+    V = np.asarray(list(base_vecs) + list(cand_vecs), dtype=np.float32)
+    V /= _row_norms(V)
+    B = np.ascontiguousarray(V[:len(base_vecs)])
+    C = np.ascontiguousarray(V[len(base_vecs):])
+    index = _faiss.IndexFlatIP(B.shape[1])
+    index.add(B)
+    scores, idx = index.search(C, 1)
+    return idx[:, 0], scores[:, 0].astype(np.float64)
+
+
 def suggest_merges(
     base: List[TaxonomyItem],
     candidates: List[NewTopicCandidate],
     *,
     base_gloss_map: Dict[str, str] | None = None,
     threshold: float = 0.85,
+    vectors: Tuple[List[List[float]], List[List[float]]] | None = None,
 ) -> List[Dict[str, Any]]:
     """Suggest merges for near-duplicate topics using embeddings.
 
     Returns a list of {candidate, target, score} for merges when cosine >= threshold.
     base_gloss_map can provide short text per existing topic id to embed (e.g., description).
+    vectors: precomputed (base_vecs, cand_vecs) from embed_merge_inputs.
     """
-    import math
-
     if not candidates or not base:
         return []
 
-    base_ids = [t.id for t in base]
-    base_texts = [
-        f"{tid} - {base_gloss_map.get(tid, '') if base_gloss_map else ''}".strip()
-        for tid in base_ids
-    ]
-    cand_ids = [slugify(getattr(c, 'topic_id', None) or c.label) for c in candidates]
-    cand_texts = [
-        f"{cid} - {(c.why_new or '')} | {(c.evidence or '')}".strip()
-        for cid, c in zip(cand_ids, candidates)
-    ]
-
-    base_vecs = embed_texts(base_texts)
-    cand_vecs = embed_texts(cand_texts)
-
-    def cosine(a, b):
-        dot = sum(x*y for x, y in zip(a, b))
-        na = math.sqrt(sum(x*x for x in a)) or 1.0
-        nb = math.sqrt(sum(y*y for y in b)) or 1.0
-        return dot / (na * nb)
+    base_ids, base_texts, cand_ids, pending, cand_texts = _merge_texts(base, candidates, base_gloss_map)
 
     merges_list: List[Dict[str, Any]] = []
     # Heuristic: exact id match -> merge
@@ -338,17 +490,16 @@ def suggest_merges(
     for cid in cand_ids:
         if cid in base_set:
             merges_list.append({"candidate": cid, "target": cid, "score": 1.0})
-
-    for i, cv in enumerate(cand_vecs):
-        best = -1.0
-        best_tid = None
-        for j, bv in enumerate(base_vecs):
-            score = cosine(cv, bv)
-            if score > best:
-                best = score
-                best_tid = base_ids[j]
-        if best >= threshold and best_tid and all(m["candidate"] != cand_ids[i] for m in merges_list):
-            merges_list.append({"candidate": cand_ids[i], "target": best_tid, "score": float(best)})
+    if not pending:
+        return merges_list
+
+    base_vecs, cand_vecs = vectors or _embed_pair(base_texts, cand_texts)
+    best_idx, best_scores = _best_matches(base_vecs, cand_vecs)
+    for k, i in enumerate(pending):
+        cid = cand_ids[i]
+        best = float(best_scores[k])
+        if best >= threshold and all(m["candidate"] != cid for m in merges_list):
+            merges_list.append({"candidate": cid, "target": base_ids[best_idx[k]], "score": best})
     return merges_list
 
 
@@ -357,55 +508,49 @@ def suggest_merges_debug(
     candidates: List[NewTopicCandidate],
     *,
     base_gloss_map: Dict[str, str] | None = None,
+    vectors: Tuple[List[List[float]], List[List[float]]] | None = None,
 ) -> Dict[str, Dict[str, Any]]:
     """Return per-candidate best match and cosine score for debugging.
 
     Shape: { candidate_id: {"best_id": <base_id>, "score": <float>} }
+    Candidates whose id already exists in base are not embedded, so no score is
+    computed for them; they are reported as {"best_id": <id>, "exact_id": True}.
     """
-    import math
     if not candidates or not base:
         return {}
 
-    base_ids = [t.id for t in base]
-    base_texts = [
-        f"{tid} - {base_gloss_map.get(tid, '') if base_gloss_map else ''}".strip()
-        for tid in base_ids
-    ]
-    cand_ids = [slugify(getattr(c, 'topic_id', None) or c.label) for c in candidates]
-    cand_texts = [
-        f"{cid} - {(c.why_new or '')} | {(c.evidence or '')}".strip()
-        for cid, c in zip(cand_ids, candidates)
-    ]
+    base_ids, base_texts, cand_ids, pending, cand_texts = _merge_texts(base, candidates, base_gloss_map)
+    matched: Dict[int, Dict[str, Any]] = {}
+    if pending:
+        base_vecs, cand_vecs = vectors or _embed_pair(base_texts, cand_texts)
+        best_idx, best_scores = _best_matches(base_vecs, cand_vecs)
+        matched = {
+            i: {"best_id": base_ids[best_idx[k]], "score": float(best_scores[k])}
+            for k, i in enumerate(pending)
+        }
+    return {
+        cid: matched.get(i) or {"best_id": cid, "exact_id": True}
+        for i, cid in enumerate(cand_ids)
+    }
 
-    base_vecs = embed_texts(base_texts)
-    cand_vecs = embed_texts(cand_texts)
 
-    def cosine(a, b):
-        dot = sum(x*y for x, y in zip(a, b))
-        na = math.sqrt(sum(x*x for x in a)) or 1.0
-        nb = math.sqrt(sum(y*y for y in b)) or 1.0
-        return dot / (na * nb)
+# ---------- Scoring ----------
+from datetime import datetime, timezone
 
-    dbg: Dict[str, Dict[str, Any]] = {}
-    for i, cv in enumerate(cand_vecs):
-        best = -1.0
-        best_tid = None
-        for j, bv in enumerate(base_vecs):
-            score = cosine(cv, bv)
-            if score > best:
-                best = score
-                best_tid = base_ids[j]
-        dbg[cand_ids[i]] = {"best_id": best_tid, "score": float(best)}
-    return dbg
 
+SCORE_CHUNK = 65536
 
-# ---------- Scoring ----------
-from datetime import datetime, timezone
-from collections import defaultdict
+
+def _age_seconds(ts: Optional[str], now: datetime) -> float:
+    try:
+        when = datetime.fromisoformat(ts) if ts else now
+    except Exception:
+        when = now
+    return (now - when).total_seconds()
 
 
 def score_mentions(
-    mentions: List[Dict[str, Any]],
+    mentions: Iterable[Dict[str, Any]],
     *,
     speaker_weights: Dict[str, float] | None = None,
     meeting_type_weights: Dict[str, float] | None = None,
@@ -415,11 +560,9 @@ def score_mentions(
     """Aggregate mention-like dicts to per-topic scores with exponential decay.
 
     Each mention should contain: topic_id or topic_label, speaker_role, meeting_type, timestamp, relevance.
-    Missing fields are defaulted conservatively.
+    Missing fields are defaulted conservatively. `mentions` is consumed once, in
+    chunks of SCORE_CHUNK, so it can be a generator over many files.
     """
-    if not mentions:
-        return {}
-
     speaker_weights = speaker_weights or {
         "customer": 1.5,
         "pm": 1.2,
@@ -435,57 +578,81 @@ def score_mentions(
     }
 
     now = now or datetime.now(timezone.utc)
-    # Decay base such that score halves every half_life_days; if None, no decay
-    per_day_decay = None if (half_life_days is None) else (0.5 ** (1.0 / max(1e-6, half_life_days)))
 
-    totals: Dict[str, float] = defaultdict(float)
-    for m in mentions:
-        tid = m.get("topic_id") or m.get("topic_label")
-        if not tid:
+    # Codes are stable across chunks, so per-chunk bincounts line up and add.
+    topic_index: Dict[str, int] = {}
+    role_index: Dict[Any, int] = {}
+    mtype_index: Dict[Any, int] = {}
+    # Records from one run share a timestamp, so each distinct string is parsed once
+    ts_index: Dict[Optional[str], int] = {}
+    ts_age: List[float] = []
+    totals = np.zeros(0)
+    it = iter(mentions)
+    while batch := list(islice(it, SCORE_CHUNK)):
+        # One pass to pull the columns out, then the weighting and the per-topic
+        # sum run as array ops instead of per-mention float math.
+        codes: List[int] = []
+        role_codes: List[int] = []
+        mtype_codes: List[int] = []
+        rel: List[float] = []
+        ts_codes: List[int] = []
+        for m in batch:
+            tid = m.get("topic_id") or m.get("topic_label")
+            if not tid:
+                continue
+            codes.append(topic_index.setdefault(slugify(tid), len(topic_index)))
+            rel.append(float(m.get("relevance", 1.0) or 1.0))
+            role_codes.append(role_index.setdefault(m.get("speaker_role") or "unknown", len(role_index)))
+            mtype_codes.append(mtype_index.setdefault(m.get("meeting_type") or "unknown", len(mtype_index)))
+            ts = m.get("timestamp")
+            ts_codes.append(ts_index.setdefault(ts if isinstance(ts, str) else None, len(ts_index)))
+
+        if not codes:
             continue
-        role = str(m.get("speaker_role") or "unknown").lower()
-        mtype = str(m.get("meeting_type") or "unknown").lower()
-        w_speaker = float(speaker_weights.get(role, 1.0))
-        w_meeting = float(meeting_type_weights.get(mtype, 1.0))
-        rel = float(m.get("relevance", 1.0) or 1.0)
 
-        ts = m.get("timestamp")
-        try:
-            when = datetime.fromisoformat(ts) if ts else now
-        except Exception:
-            when = now
-        days = max(0.0, (now - when).total_seconds() / 86400.0)
-        decay = 1.0 if per_day_decay is None else (per_day_decay ** days)
+        # Weights are looked up once per distinct role/meeting type, then gathered
+        role_w = np.array([float(speaker_weights.get(str(r).lower(), 1.0)) for r in role_index])
+        mtype_w = np.array([float(meeting_type_weights.get(str(t).lower(), 1.0)) for t in mtype_index])
+        weights = np.asarray(rel) * role_w[role_codes] * mtype_w[mtype_codes]
+        # Score halves every half_life_days; if None, no decay
+        if half_life_days is not None:
+            ts_age.extend(_age_seconds(ts, now) for ts in islice(ts_index, len(ts_age), None))
+            days = np.maximum(np.asarray(ts_age)[ts_codes] / 86400.0, 0.0)
+            weights *= np.exp2(-days / max(1e-6, half_life_days))
 
-        totals[slugify(tid)] += rel * w_speaker * w_meeting * decay
+        chunk_totals = np.bincount(codes, weights=weights, minlength=len(topic_index))
+        chunk_totals[:len(totals)] += totals
+        totals = chunk_totals
 
-    return dict(totals)
+    return dict(zip(topic_index, totals.tolist()))
 
 
 def create_mention_records(
     meeting: Dict[str,Any],
-    chunks: List[Chunk],
+    chunks: List[Chunk] | ChunkTable,
     mentions: List[Mention]
 ) -> Dict[str,Any]:
     meeting_id = meeting["meeting_id"]
     meeting_type = meeting.get("meeting_type","")
     now_iso = utc_now_iso()
-    chunk_map = {c.chunk_id: c for c in chunks}
+    table = chunks if isinstance(chunks, ChunkTable) else ChunkTable.from_chunks(chunks)
+    chunk_index = table.index()
+    speakers = table.speakers
+    texts = table.texts
 
-    records = []
-    for m in mentions:
-        ch = chunk_map.get(m.chunk_id)
-        if not ch: 
-            continue
-        records.append({
+    records = [
+        {
             "meeting_id": meeting_id,
-            "chunk_hash": chunk_hash(ch.text),
-            "topic_id": getattr(m, 'topic_id', None) or m.topic_label,
-            "speaker_role": ch.speaker or "unknown",
+            "chunk_hash": chunk_hash(texts[i]),
+            "topic_id": m.topic_id or m.topic_label,
+            "speaker_role": speakers[i] or "unknown",
             "meeting_type": meeting_type,
-            "relevance": float(m.relevance) if getattr(m, 'relevance', None) is not None else 1.0,
+            "relevance": float(m.relevance) if m.relevance is not None else 1.0,
             "timestamp": now_iso
-        })
+        }
+        for m in mentions
+        if (i := chunk_index.get(m.chunk_id)) is not None
+    ]
     return {"mention_records": records, "num_records": len(records)}
 
 
@@ -494,6 +661,6 @@ def create_mention_records(
 def write_artifacts(run_dir: str, **files):
     os.makedirs(run_dir, exist_ok=True)
     for name, obj in files.items():
-        json_dump(obj, os.path.join(run_dir, f"{name}.json"))
+        json_dump(obj, os.path.join(run_dir, f"{name}.json"), makedirs=False)
 
 
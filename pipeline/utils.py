@@ -1,16 +1,23 @@
-import hashlib, json, re, orjson, os
+import functools, hashlib, json, re, orjson, os
 from datetime import datetime, timezone
 from typing import Any, Iterable
 
 
+_SLUG_NONALNUM = re.compile(r"[^a-z0-9]+")
+_SLUG_DASHES = re.compile(r"-{2,}")
+
+
+@functools.lru_cache(maxsize=16384)
 def slugify(s: str) -> str:
     s = (s or "").strip().lower()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    return re.sub(r"-{2,}", "-", s).strip("-") or "topic"
+    s = _SLUG_NONALNUM.sub("-", s)
+    return _SLUG_DASHES.sub("-", s).strip("-") or "topic"
 
 
-def json_dump(obj: Any, path: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+def json_dump(obj: Any, path: str, makedirs: bool = True) -> None:
+    # Callers writing many files into one dir create it once and pass makedirs=False
+    if makedirs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "wb") as f:
         f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
 
@@ -20,7 +27,14 @@ def load_json(path: str):
         return orjson.loads(f.read())
 
 
+# chunk_hash is content addressing, not security. SIGNALS_FAST_HASH=1 swaps
+# SHA-256 for a 128-bit BLAKE2b; hashes then won't match earlier runs.
+_FAST_HASH = os.environ.get("SIGNALS_FAST_HASH") == "1"
+
+
 def chunk_hash(text: str) -> str:
+    if _FAST_HASH:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
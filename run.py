@@ -1,18 +1,27 @@
-import argparse, os, uuid
+import argparse, asyncio, os, shutil, sys, uuid
 from pathlib import Path
+import orjson
 from pipeline.steps import (
-    load_meeting, load_taxonomy, naive_chunks,
+    load_meeting, load_taxonomy, load_taxonomy_validated, naive_chunks_soa,
     detect_new_topics, chunk_and_tag,
     update_taxonomy, create_mention_records,
     write_artifacts
 )
-from pipeline.models import NewTopicCandidate
+from pipeline.models import CandidateList, NewTopicCandidate
 from pipeline.utils import slugify
 
 
+def _own_artifact(path, run_dir, *names) -> bool:
+    """True if `path` resolves to one of `names` inside `run_dir`, i.e. a file this pipeline wrote."""
+    if not run_dir:
+        return False
+    p = Path(path).resolve()
+    return p.parent == Path(run_dir).resolve() and p.name in names
+
+
 def cmd_detect(args):
     meeting = load_meeting(args.meeting)
-    taxonomy = load_taxonomy(args.taxonomy)
+    taxonomy = load_taxonomy_validated(args.taxonomy)
     out = detect_new_topics(meeting, taxonomy)
     run_dir = args.out or f"runs/{uuid.uuid4().hex}"
     write_artifacts(run_dir, new_topics=out.model_dump())
@@ -36,8 +45,12 @@ def cmd_chunk_tag(args):
         else:
             tax_path = "data/base_taxonomy.json"
             print(f"⚠ no run taxonomy found; falling back to {tax_path}")
-    taxonomy = load_taxonomy(tax_path)
-    chunks = naive_chunks(meeting)
+    # The run's own update-taxonomy output is trusted; anything else is validated
+    if _own_artifact(tax_path, args.out, eff.name, upd.name):
+        taxonomy = load_taxonomy(tax_path)
+    else:
+        taxonomy = load_taxonomy_validated(tax_path)
+    chunks = naive_chunks_soa(meeting)
     mentions_resp = chunk_and_tag(meeting, taxonomy, chunks)
     recs = create_mention_records(
         meeting, chunks, [m for m in mentions_resp.mentions]
@@ -45,7 +58,7 @@ def cmd_chunk_tag(args):
     run_dir = args.out or f"runs/{uuid.uuid4().hex}"
     write_artifacts(
         run_dir,
-        chunks=[c.model_dump() for c in chunks],
+        chunks=chunks.records(),
         mentions=mentions_resp.model_dump(),
         mention_records=recs
     )
@@ -53,9 +66,8 @@ def cmd_chunk_tag(args):
 
 
 def cmd_update_taxonomy(args):
-    import orjson, os
-    from pipeline.steps import suggest_merges, suggest_merges_debug
-    base = load_taxonomy(args.taxonomy)
+    from pipeline.steps import embed_merge_inputs, embed_merge_inputs_async, suggest_merges, suggest_merges_debug
+    base = load_taxonomy_validated(args.taxonomy)
     if args.candidates.endswith(".json"):
         cand = orjson.loads(open(args.candidates,"rb").read())
         lst = cand["new_topics"] if "new_topics" in cand else cand
@@ -69,24 +81,46 @@ def cmd_update_taxonomy(args):
             pass
     else:
         raise SystemExit("pass --candidates <path to new_topics.json>")
-    candidates = [NewTopicCandidate(**c) for c in lst]
+    # The run's own new_topics.json (and approved_new_topics.json beside it) came
+    # from validated output; candidates from anywhere else are validated here
+    if _own_artifact(args.candidates, args.out, "new_topics.json"):
+        candidates = [NewTopicCandidate.model_construct(**c) for c in lst]
+    else:
+        candidates = CandidateList.validate_python(lst)
+    # Embed once; suggestions and debug compare the same vectors
+    vectors = None
+    try:
+        asyncio.get_running_loop()
+        in_loop = True
+    except RuntimeError:
+        in_loop = False
+    try:
+        if in_loop:
+            # asyncio.run() can't nest inside a caller's running loop
+            vectors = embed_merge_inputs(base, candidates)
+        else:
+            # Base and candidate texts are embedded concurrently
+            vectors = asyncio.run(embed_merge_inputs_async(base, candidates))
+    except Exception as e:
+        print(f"⚠ embedding failed; skipping merge suggestions: {e}", file=sys.stderr)
+        vectors = None
     merges = []
-    if args.merge_threshold is not None:
+    if args.merge_threshold is not None and vectors is not None:
         try:
-            merges = suggest_merges(base, candidates, threshold=float(args.merge_threshold))
+            merges = suggest_merges(base, candidates, threshold=float(args.merge_threshold), vectors=vectors)
         except Exception as e:
             merges = []
     merge_debug = {}
-    try:
-        merge_debug = suggest_merges_debug(base, candidates)
-    except Exception:
-        merge_debug = {}
+    if vectors is not None:
+        try:
+            merge_debug = suggest_merges_debug(base, candidates, vectors=vectors)
+        except Exception:
+            merge_debug = {}
     # Apply user merges (alias) only if merges.json exists; suggestions are hints only
     user_merges_path = os.path.join(os.path.dirname(args.candidates), "merges.json")
     alias_map = {}
     if os.path.exists(user_merges_path):
         try:
-            import orjson
             mj = orjson.loads(open(user_merges_path, "rb").read())
             for m in (mj.get("merges") or []):
                 alias_map[slugify(m.get("from"))] = slugify(m.get("to"))
@@ -102,52 +136,62 @@ def cmd_update_taxonomy(args):
         added_topic_ids=added,
         merge_suggestions={"suggestions": merges},
         num_topics=len(updated),
-        effective_taxonomy=[t.model_dump() for t in updated]
+        effective_taxonomy=[t.model_dump() for t in updated],
+        merge_debug=merge_debug
     )
-    # Write separate debug and suggestions artifacts for clarity
-    try:
-        import orjson
-        open(os.path.join(run_dir, "merge_suggestions.json"), "wb").write(orjson.dumps({"suggestions": merges}))
-        open(os.path.join(run_dir, "merge_debug.json"), "wb").write(orjson.dumps(merge_debug))
-    except Exception:
-        pass
     print(f"✔ wrote {run_dir}/taxonomy_json_updated.json")
 
 
 def cmd_score_topics(args):
-    import glob, json
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
     from pipeline.steps import score_mentions
+    from pipeline.utils import json_dump, load_json
 
     paths = []
     if os.path.isdir(args.mentions):
-        # Prefer mention_records.json; fallback to mentions.json
-        paths = (
-            glob.glob(os.path.join(args.mentions, "**", "mention_records.json"), recursive=True)
-            + glob.glob(os.path.join(args.mentions, "**", "mentions.json"), recursive=True)
-        )
+        # Prefer mention_records.json; fallback to mentions.json. One walk finds both.
+        records, mentions = [], []
+        for root, dirs, files in os.walk(args.mentions):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            if "mention_records.json" in files:
+                records.append(os.path.join(root, "mention_records.json"))
+            if "mentions.json" in files:
+                mentions.append(os.path.join(root, "mentions.json"))
+        paths = records + mentions
     else:
         paths = [args.mentions]
 
-    all_mentions = []
-    for pth in paths:
+    def read_records(pth):
         try:
-            with open(pth, "r", encoding="utf-8") as f:
-                obj = json.load(f)
-                if isinstance(obj, dict):
-                    if "mention_records" in obj and isinstance(obj["mention_records"], list):
-                        all_mentions.extend(obj["mention_records"])
-                    elif "mentions" in obj and isinstance(obj["mentions"], list):
-                        all_mentions.extend(obj["mentions"])
-                elif isinstance(obj, list):
-                    all_mentions.extend(obj)
+            obj = load_json(pth)
         except Exception:
-            continue
+            return []
+        if isinstance(obj, dict):
+            if isinstance(obj.get("mention_records"), list):
+                return obj["mention_records"]
+            if isinstance(obj.get("mentions"), list):
+                return obj["mentions"]
+            return []
+        return obj if isinstance(obj, list) else []
+
+    def iter_mentions(read_ahead=8):
+        # Files are read on a thread pool but at most `read_ahead` ahead of
+        # score_mentions, so only a handful of parsed files are held at once
+        with ThreadPoolExecutor(max_workers=read_ahead) as ex:
+            pending = deque()
+            for pth in paths:
+                pending.append(ex.submit(read_records, pth))
+                if len(pending) >= read_ahead:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
 
     # Parse meeting type weights JSON if provided
     mtw = {}
     try:
         if getattr(args, 'meeting_type_weights', None):
-            mtw = json.loads(args.meeting_type_weights)
+            mtw = orjson.loads(args.meeting_type_weights)
     except Exception:
         mtw = {}
 
@@ -156,16 +200,39 @@ def cmd_score_topics(args):
     if hld is not None and hld <= 0:
         hld = None
 
-    scores = score_mentions(all_mentions, meeting_type_weights=mtw or None, half_life_days=(hld if hld else 7.0))
+    scores = score_mentions(iter_mentions(), meeting_type_weights=mtw or None, half_life_days=(hld if hld else 7.0))
     run_dir = args.out or f"runs/{uuid.uuid4().hex}"
-    os.makedirs(run_dir, exist_ok=True)
-    with open(os.path.join(run_dir, "topic_scores.json"), "w", encoding="utf-8") as f:
-        json.dump({"scores": [{"topic_id": k, "score": v} for k, v in sorted(scores.items(), key=lambda kv: -kv[1])],
-                   "meta": {"half_life_days": hld if hld else 7.0, "meeting_type_weights": mtw}}, f, indent=2)
+    json_dump({"scores": [{"topic_id": k, "score": v} for k, v in sorted(scores.items(), key=lambda kv: -kv[1])],
+               "meta": {"half_life_days": hld if hld else 7.0, "meeting_type_weights": mtw}},
+              os.path.join(run_dir, "topic_scores.json"))
     print(f"✔ wrote {os.path.join(run_dir, 'topic_scores.json')}")
 
 
-def main():
+def run_pipeline(meeting, taxonomy, out_dir, auto_approve=False, merge_threshold=None, default_score=0.5) -> dict:
+    """Run detect-new-topics -> update-taxonomy -> chunk-tag in-process.
+
+    Same steps and artifacts as invoking the three subcommands in turn, without
+    paying interpreter startup and imports per step. Returns the artifact paths.
+    """
+    out_dir = str(out_dir)
+    cmd_detect(argparse.Namespace(meeting=str(meeting), taxonomy=str(taxonomy), out=out_dir))
+    new_topics = os.path.join(out_dir, "new_topics.json")
+    approved = os.path.join(out_dir, "approved_new_topics.json")
+    if auto_approve and not os.path.exists(approved):
+        shutil.copyfile(new_topics, approved)
+    cmd_update_taxonomy(argparse.Namespace(
+        taxonomy=str(taxonomy), candidates=new_topics, default_score=default_score,
+        merge_threshold=merge_threshold, out=out_dir,
+    ))
+    # No --taxonomy: chunk-tag picks up effective_taxonomy.json from out_dir
+    cmd_chunk_tag(argparse.Namespace(meeting=str(meeting), taxonomy=None, out=out_dir))
+    return {
+        name: os.path.join(out_dir, f"{name}.json")
+        for name in ("new_topics", "taxonomy_json_updated", "effective_taxonomy", "chunks", "mentions", "mention_records")
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser()
     sub = p.add_subparsers(dest="cmd", required=True)
 
@@ -195,8 +262,11 @@ def main():
     s.add_argument("--half-life-days", type=float, default=7.0)
     s.add_argument("--meeting-type-weights", dest="meeting_type_weights", default=None)
     s.set_defaults(func=cmd_score_topics)
+    return p
+
 
-    args = p.parse_args()
+def main(argv=None):
+    args = build_parser().parse_args(argv)
     args.func(args)
 
 
@@ -3,27 +3,25 @@
 Backfill script to migrate existing run data to Supabase.
 """
 
-import json
-import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List
 from datetime import datetime
 
-# Add the parent directory to the path so we can import pipeline modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import orjson
 
 from pipeline.db import (
-    insert_session, insert_speaker, insert_utterances, insert_chunks,
-    insert_candidates, insert_mentions, upsert_topic, add_alias,
-    log_event
+    insert_session, insert_speakers, insert_utterances, insert_chunks,
+    insert_candidates, insert_mentions, upsert_topics, add_aliases,
+    log_event, flush_events
 )
 
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
     """Load and parse a JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return orjson.loads(file_path.read_bytes())
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
         return {}
@@ -58,23 +56,25 @@ def backfill_from_run(run_dir: Path) -> bool:
         print(f"Error inserting session: {e}")
         return False
     
-    # Insert speakers
-    speaker_map = {}
-    for speaker_info in meeting_data.get("speakers", []):
-        speaker_data = {
+    # Insert speakers (one bulk insert; ids come back in the response)
+    speaker_rows = [
+        {
             "display_name": speaker_info.get("name", "Unknown"),
             "email": speaker_info.get("email"),
             "is_internal": speaker_info.get("is_internal", False),
             "org": speaker_info.get("org"),
             "meta_json": speaker_info
         }
-        
+        for speaker_info in meeting_data.get("speakers", [])
+    ]
+    speaker_map = {}
+    if speaker_rows:
         try:
-            speaker_id = insert_speaker(speaker_data)
-            speaker_map[speaker_info.get("name", "Unknown")] = speaker_id
-            print(f"Inserted speaker: {speaker_id} ({speaker_info.get('name', 'Unknown')})")
+            for row in insert_speakers(speaker_rows):
+                speaker_map[row["display_name"]] = row["speaker_id"]
+            print(f"Inserted {len(speaker_map)} speakers")
         except Exception as e:
-            print(f"Error inserting speaker {speaker_info.get('name', 'Unknown')}: {e}")
+            print(f"Error inserting speakers: {e}")
     
     # Insert utterances
     utterances = []
@@ -127,22 +127,25 @@ def backfill_from_run(run_dir: Path) -> bool:
     
     # Insert taxonomy topics
     if taxonomy_data:
+        topic_rows, alias_rows = [], []
         for topic in taxonomy_data.get("topics", []):
+            topic_id = topic.get("id", topic.get("label"))
+            topic_rows.append({
+                "id": topic_id,
+                "label": topic.get("label", ""),
+                "description": topic.get("description"),
+                "created_by": "backfill"
+            })
+            # Add aliases if they exist
+            alias_rows.extend({"alias": alias, "topic_id": topic_id} for alias in topic.get("aliases", []))
+        
+        if topic_rows:
             try:
-                upsert_topic(
-                    topic_id=topic.get("id", topic.get("label")),
-                    label=topic.get("label", ""),
-                    description=topic.get("description"),
-                    created_by="backfill"
-                )
-                
-                # Add aliases if they exist
-                for alias in topic.get("aliases", []):
-                    add_alias(alias, topic.get("id", topic.get("label")))
-                
-                print(f"Inserted topic: {topic.get('id', topic.get('label'))}")
+                upsert_topics(topic_rows)
+                add_aliases(alias_rows)
+                print(f"Inserted {len(topic_rows)} topics, {len(alias_rows)} aliases")
             except Exception as e:
-                print(f"Error inserting topic {topic.get('id', topic.get('label'))}: {e}")
+                print(f"Error inserting topics: {e}")
     
     # Insert candidates if they exist
     candidates_file = run_dir / "new_topics.json"
@@ -182,21 +185,23 @@ def backfill_from_run(run_dir: Path) -> bool:
             except Exception as e:
                 print(f"Error inserting mentions: {e}")
     
-    # Log the backfill event
-    try:
-        log_event(
-            event_type="backfill_completed",
-            session_id=session_id,
-            actor="backfill_script"
-        )
-    except Exception as e:
-        print(f"Error logging event: {e}")
+    # Log the backfill event (queued; main() flushes before reporting)
+    log_event(
+        event_type="backfill_completed",
+        session_id=session_id,
+        actor="backfill_script"
+    )
     
     return True
 
 
 def main():
     """Main backfill function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Run directories to backfill concurrently (default: 8)")
+    args = parser.parse_args()
+
     repo_root = Path(__file__).parent.parent
     runs_dir = repo_root / "runs"
     
@@ -204,8 +209,8 @@ def main():
         print(f"Runs directory not found: {runs_dir}")
         return
     
-    # Find all run directories
-    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
+    # Find all run directories (skipping the viewer's hidden .staging dir)
+    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir() and not d.name.startswith(".")]
     
     if not run_dirs:
         print("No run directories found")
@@ -213,11 +218,14 @@ def main():
     
     print(f"Found {len(run_dirs)} run directories")
     
-    success_count = 0
-    for run_dir in run_dirs:
-        if backfill_from_run(run_dir):
-            success_count += 1
-        print("-" * 50)
+    # Each run is independent and I/O-bound on Supabase round-trips, so threads overlap them
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        success_count = sum(pool.map(backfill_from_run, run_dirs))
+
+    try:
+        flush_events()
+    except Exception as e:
+        print(f"Error logging events: {e}")
     
     print(f"Successfully processed {success_count}/{len(run_dirs)} runs")
 
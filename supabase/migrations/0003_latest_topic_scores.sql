@@ -0,0 +1,11 @@
+-- Latest scoring run's scores as one view, so readers need a single round-trip
+-- instead of "find latest run_id" followed by "fetch its scores".
+
+create index if not exists idx_scoring_runs_run_at on scoring_runs(run_at desc);
+
+create or replace view latest_topic_scores as
+select ts.*
+from topic_scores ts
+where ts.run_id = (
+  select run_id from scoring_runs order by run_at desc limit 1
+);
@@ -0,0 +1,25 @@
+-- Seed sample topics, their aliases and the setup audit event in one round-trip.
+-- Called by scripts/setup_supabase.py via rpc("seed_sample_data"); runs as a single
+-- transaction, so a failed seed leaves nothing half-written.
+
+create or replace function seed_sample_data(p_topics jsonb, p_aliases jsonb, p_event jsonb)
+returns void as $$
+begin
+  insert into topics (id, label, description, created_by)
+  select t->>'id', t->>'label', t->>'description', t->>'created_by'
+  from jsonb_array_elements(p_topics) as t
+  on conflict (id) do update
+    set label = excluded.label,
+        description = excluded.description,
+        created_by = excluded.created_by;
+
+  insert into topic_aliases (alias, topic_id)
+  select a->>'alias', a->>'topic_id'
+  from jsonb_array_elements(p_aliases) as a
+  on conflict (alias) do update
+    set topic_id = excluded.topic_id;
+
+  insert into events (event_type, actor, payload_json)
+  values (p_event->>'event_type', p_event->>'actor', p_event->'payload_json');
+end;
+$$ language plpgsql;
@@ -1,19 +1,24 @@
-import orjson, os
+import mmap, orjson
+from pathlib import Path
 
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+BASE_TAXONOMY = DATA_DIR / "base_taxonomy.json"
+SAMPLE_MTG = DATA_DIR / "sample_meeting_01.json"
 
-def read_json(path: str):
-    with open(path, "rb") as f:
-        return orjson.loads(f.read())
+
+def read_json(path: Path):
+    # Parse straight from the mapped file; no intermediate bytes copy
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as buf:
+            return orjson.loads(buf)
 
 
 def test_shapes_exist(tmp_path):
     # This is a placeholder: we won't actually call OpenAI in tests.
     # Instead, ensure repo structure is correct and data fixtures parse.
-    base = read_json(os.path.abspath("data/base_taxonomy.json"))
-    mtg = read_json(os.path.abspath("data/sample_meeting_01.json"))
+    base = read_json(BASE_TAXONOMY)
+    mtg = read_json(SAMPLE_MTG)
 
     assert isinstance(base, list)
     assert all("id" in t for t in base)
     assert "transcript" in mtg and isinstance(mtg["transcript"], list)
-
-
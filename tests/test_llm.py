@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from tenacity import wait_none
+
+import pipeline.llm as llm
+from pipeline.models import NewTopicResponse
+
+
+class FakeClient:
+    """Stands in for OpenAI(): returns the queued completion texts in order."""
+
+    def __init__(self, contents):
+        self.contents = list(contents)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.embeddings = SimpleNamespace(create=self.embed)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = self.contents.pop(0)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")])
+
+    def embed(self, model, input):
+        self.calls += 1
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(t))]) for t in input])
+
+
+@pytest.fixture
+def fake_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(llm._call_parsed.retry, "wait", wait_none())
+
+    def install(*contents):
+        client = FakeClient(contents)
+        monkeypatch.setattr(llm, "_client", client)
+        return client
+    return install
+
+
+def test_malformed_completion_is_retried(fake_client):
+    client = fake_client('{"new_topics": [', '{"new_topics": []}')
+    resp = llm.call_and_validate("sys", "user", "NewTopicDetection", {}, NewTopicResponse)
+    assert resp.new_topics == []
+    assert client.calls == 2
+
+
+def test_only_valid_completions_are_cached(fake_client):
+    client = fake_client('{"new_topics": [', '{"new_topics": []}')
+    llm.call_and_validate("sys", "user", "NewTopicDetection", {}, NewTopicResponse)
+    # The rerun is served from the cache, which holds the valid reply
+    resp = llm.call_and_validate("sys", "user", "NewTopicDetection", {}, NewTopicResponse)
+    assert resp.new_topics == []
+    assert client.calls == 2
+
+
+def test_unparseable_cache_entry_is_dropped(fake_client):
+    _, cache_path = llm._chat_request("sys", "user", "NewTopicDetection", {}, None)
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_bytes(b'{"new_topics": [')
+    client = fake_client('{"new_topics": []}')
+    resp = llm.call_and_validate("sys", "user", "NewTopicDetection", {}, NewTopicResponse)
+    assert resp.new_topics == []
+    assert client.calls == 1
+    assert cache_path.read_bytes() == b'{"new_topics": []}'
+
+
+def test_oversize_embed_inside_running_loop(fake_client, monkeypatch):
+    monkeypatch.setattr(llm, "EMBED_BATCH", 2)
+    client = fake_client()
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    async def handler():
+        return llm.embed_texts(texts)
+
+    assert asyncio.run(handler()) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert client.calls == 3
@@ -15,3 +15,20 @@ def test_meeting_type_weights_affect_scores():
     scores2 = score_mentions(mentions, meeting_type_weights=weights2, half_life_days=None)
     assert scores2["integrations"] > scores["integrations"]
 
+
+
+def test_decay_halves_score_every_half_life():
+    from datetime import datetime, timezone
+    now = datetime(2025, 8, 15, tzinfo=timezone.utc)
+    mentions = [
+        {"topic_id": "fresh", "relevance": 1.0, "timestamp": "2025-08-15T00:00:00+00:00"},
+        {"topic_id": "week-old", "relevance": 1.0, "timestamp": "2025-08-08T00:00:00+00:00"},
+        {"topic_id": "Week Old", "relevance": 1.0, "timestamp": "2025-08-08T00:00:00+00:00"},
+        {"topic_id": "future", "relevance": 1.0, "timestamp": "2025-08-20T00:00:00+00:00"},
+        {"topic_id": "undated", "relevance": 1.0, "timestamp": "not-a-date"},
+    ]
+    scores = score_mentions(mentions, half_life_days=7, now=now)
+    assert abs(scores["fresh"] - 1.0) < 1e-9
+    assert abs(scores["week-old"] - 1.0) < 1e-9  # two mentions, each halved
+    assert abs(scores["future"] - 1.0) < 1e-9  # future timestamps don't grow
+    assert abs(scores["undated"] - 1.0) < 1e-9
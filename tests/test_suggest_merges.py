@@ -0,0 +1,92 @@
+import math
+import pipeline.steps as steps
+from pipeline.models import NewTopicCandidate, TaxonomyItem
+
+
+VECS = {
+    "onboarding": [1.0, 0.0, 0.0],
+    "dashboard": [0.0, 1.0, 0.0],
+    "sso-setup": [0.9, 0.1, 0.0],
+    "charts": [0.1, 0.8, 0.3],
+    "zero": [0.0, 0.0, 0.0],
+}
+
+
+def fake_embed(texts, model=None):
+    return [VECS[t.split(" -")[0]] for t in texts]
+
+
+def brute_force(base_ids, cand_ids):
+    def cosine(a, b):
+        dot = sum(x*y for x, y in zip(a, b))
+        na = math.sqrt(sum(x*x for x in a)) or 1.0
+        nb = math.sqrt(sum(y*y for y in b)) or 1.0
+        return dot / (na * nb)
+    out = {}
+    for cid in cand_ids:
+        scores = [cosine(VECS[cid], VECS[bid]) for bid in base_ids]
+        j = max(range(len(scores)), key=scores.__getitem__)
+        out[cid] = {"best_id": base_ids[j], "score": scores[j]}
+    return out
+
+
+def test_vectorised_cosine_matches_pairwise(monkeypatch):
+    monkeypatch.setattr(steps, "embed_texts", fake_embed)
+    base = [TaxonomyItem(id="onboarding"), TaxonomyItem(id="dashboard")]
+    cands = [
+        NewTopicCandidate(topic_id=c, label=c, evidence="e", why_new="w")
+        for c in ("sso-setup", "charts", "zero", "onboarding")
+    ]
+
+    dbg = steps.suggest_merges_debug(base, cands)
+    expected = brute_force(["onboarding", "dashboard"], ["sso-setup", "charts", "zero"])
+    assert dbg.keys() == {*expected, "onboarding"}
+    assert dbg["onboarding"] == {"best_id": "onboarding", "exact_id": True}
+    for cid, exp in expected.items():
+        assert dbg[cid]["best_id"] == exp["best_id"]
+        assert math.isclose(dbg[cid]["score"], exp["score"], abs_tol=1e-9)
+
+    merges = steps.suggest_merges(base, cands, threshold=0.95)
+    assert merges == [
+        {"candidate": "onboarding", "target": "onboarding", "score": 1.0},
+        {"candidate": "sso-setup", "target": "onboarding", "score": expected["sso-setup"]["score"]},
+    ]
+
+
+def test_precomputed_vectors_skip_embedding(monkeypatch):
+    calls = []
+    monkeypatch.setattr(steps, "embed_texts", lambda texts, model=None: calls.append(texts) or fake_embed(texts))
+    base = [TaxonomyItem(id="onboarding"), TaxonomyItem(id="dashboard")]
+    cands = [NewTopicCandidate(topic_id="charts", label="charts", evidence="e", why_new="w")]
+
+    vectors = steps.embed_merge_inputs(base, cands)
+    assert len(calls) == 1  # base and candidate texts share one request
+    steps.suggest_merges(base, cands, threshold=0.5, vectors=vectors)
+    steps.suggest_merges_debug(base, cands, vectors=vectors)
+    assert len(calls) == 1
+
+
+def test_exact_id_matches_are_not_embedded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(steps, "embed_texts", lambda texts, model=None: calls.append(texts) or fake_embed(texts))
+    base = [TaxonomyItem(id="onboarding"), TaxonomyItem(id="dashboard")]
+    cands = [
+        NewTopicCandidate(topic_id=c, label=c, evidence="e", why_new="w")
+        for c in ("onboarding", "charts")
+    ]
+
+    merges = steps.suggest_merges(base, cands, threshold=0.5)
+    assert [t.split(" -")[0] for t in calls[0]] == ["onboarding", "dashboard", "charts"]
+    assert merges[0] == {"candidate": "onboarding", "target": "onboarding", "score": 1.0}
+    assert merges[1]["candidate"] == "charts" and merges[1]["target"] == "dashboard"
+
+    calls.clear()
+    assert steps.suggest_merges(base, cands[:1]) == [merges[0]]
+    # Debug output labels the exact match rather than reporting a score it never computed
+    assert steps.suggest_merges_debug(base, cands) == {
+        "onboarding": {"best_id": "onboarding", "exact_id": True},
+        "charts": {"best_id": "dashboard", "score": merges[1]["score"]},
+    }
+    calls.clear()
+    assert steps.suggest_merges_debug(base, cands[:1]) == {"onboarding": {"best_id": "onboarding", "exact_id": True}}
+    assert calls == []
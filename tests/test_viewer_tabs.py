@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import orjson
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_active_run_can_also_be_browsed(tmp_path, monkeypatch):
+    # The sidebar browser lists RUNS_DIR, so the run must live there
+    monkeypatch.setenv("SIGNALS_RUNS_DIR", str(tmp_path))
+    run_dir = tmp_path / "test-run"
+    run_dir.mkdir()
+    (run_dir / "taxonomy_updated.json").write_bytes(orjson.dumps([{"id": "onboarding", "label": "Onboarding"}]))
+    (run_dir / "mentions.json").write_bytes(orjson.dumps([{"chunk_id": "c1", "topic_id": "onboarding"}]))
+
+    at = AppTest.from_file(str(REPO_ROOT / "app" / "viewer.py"), default_timeout=30)
+    at.session_state["active_run_dir"] = str(run_dir)
+    at.run()
+    at.sidebar.selectbox[0].select(run_dir.name).run()
+
+    assert not at.exception
+    # Taxonomy and mentions downloads, once per render of the same run
+    assert len(at.get("download_button")) == 4